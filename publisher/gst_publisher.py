@@ -1,9 +1,11 @@
 # publisher/gst_publisher.py
 import asyncio
-import json
+import socket
+import sys
 import threading
 from typing import Optional
 
+import orjson
 import websockets
 
 import gi
@@ -17,6 +19,8 @@ Gst.init(None)
 
 STUN_SERVER = "stun://stun.l.google.com:19302"
 
+HELLO_PUBLISHER = b'{"type":"hello","role":"publisher"}'
+
 
 def build_pipeline(
     video_dev: str,
@@ -61,8 +65,7 @@ def build_pipeline(
 
 
 def sdp_from_text(sdp_text: str) -> GstSdp.SDPMessage:
-    _res, msg = GstSdp.SDPMessage.new()
-    GstSdp.sdp_message_parse_buffer(sdp_text.encode("utf-8"), msg)
+    _res, msg = GstSdp.SDPMessage.new_from_text(sdp_text)
     return msg
 
 
@@ -96,11 +99,37 @@ async def main() -> None:
     assert webrtc is not None
 
     async with websockets.connect(
-        args.signaling, ping_interval=20, ping_timeout=20
+        args.signaling,
+        ping_interval=60,
+        ping_timeout=30,
+        # Per-connection buffering trade-off: 64 queued frames absorb an ICE
+        # burst; single frames and the write buffer are bounded to 1 MiB.
+        max_queue=64,
+        max_size=2**20,
+        write_limit=2**20,
+        compression=None,
     ) as ws:
-        await ws.send(json.dumps({"type": "hello", "role": "publisher"}))
+        # No Nagle: small candidate frames must not wait on delayed ACKs
+        sock = ws.transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        await ws.send(HELLO_PUBLISHER)
         print("[gst] connected + hello as publisher")
 
+        # ---- Single WS writer, fed from GStreamer threads ----
+        out_q: asyncio.Queue[bytes] = asyncio.Queue()
+
+        async def writer():
+            while True:
+                await ws.send(await out_q.get())
+
+        writer_task = loop.create_task(writer())
+
+        def post(msg):
+            # call_soon_threadsafe is far cheaper than a Task + Future per frame
+            loop.call_soon_threadsafe(out_q.put_nowait, orjson.dumps(msg))
+
         # ---- GStreamer -> WS ICE candidates ----
         def on_ice_candidate(_webrtc, mlineindex, candidate):
             msg = {
@@ -110,7 +139,7 @@ async def main() -> None:
                     "sdpMLineIndex": int(mlineindex),
                 },
             }
-            asyncio.run_coroutine_threadsafe(ws.send(json.dumps(msg)), loop)
+            post(msg)
 
         webrtc.connect("on-ice-candidate", on_ice_candidate)
 
@@ -129,13 +158,14 @@ async def main() -> None:
                 print("[gst] offer is None; promise reply:", txt)
                 return
 
-            # Set local description
-            webrtc.emit("set-local-description", offer, Gst.Promise.new())
+            # Set local description. Nothing waits on the result, so no promise:
+            # only create-offer needs one (its reply carries the offer).
+            webrtc.emit("set-local-description", offer, None)
 
             # Send offer SDP over WS
             sdp_text = offer.sdp.as_text()
             msg = {"type": "offer", "sdp": {"type": "offer", "sdp": sdp_text}}
-            asyncio.run_coroutine_threadsafe(ws.send(json.dumps(msg)), loop)
+            post(msg)
             print("[gst] sent offer")
 
         def create_offer():
@@ -152,8 +182,13 @@ async def main() -> None:
         pipeline.set_state(Gst.State.PLAYING)
 
         # ---- WS receive loop: answer, ICE ----
-        async for raw in ws:
-            msg = json.loads(raw)
+        while True:
+            try:
+                # Raw bytes: skip websockets' UTF-8 decode, orjson validates anyway
+                raw = await ws.recv(decode=False)
+            except websockets.ConnectionClosedOK:
+                break
+            msg = orjson.loads(raw)
             t = msg.get("type")
 
             if t == "answer":
@@ -167,7 +202,7 @@ async def main() -> None:
                 answer = GstWebRTC.WebRTCSessionDescription.new(
                     GstWebRTC.WebRTCSDPType.ANSWER, sdpmsg
                 )
-                webrtc.emit("set-remote-description", answer, Gst.Promise.new())
+                webrtc.emit("set-remote-description", answer, None)
                 print("[gst] set remote description (answer)")
                 continue
 
@@ -179,10 +214,37 @@ async def main() -> None:
                     webrtc.emit("add-ice-candidate", int(mline), cand)
                 continue
 
+            if t == "candidates":
+                # Batched trickle ICE from the subscriber: {type, items: [...]}
+                items = msg.get("items")
+                if not isinstance(items, list):
+                    continue
+                for c in items:
+                    if not isinstance(c, dict):
+                        continue
+                    cand = c.get("candidate")
+                    mline = c.get("sdpMLineIndex")
+                    if cand is not None and mline is not None:
+                        webrtc.emit("add-ice-candidate", int(mline), cand)
+                continue
+
+        writer_task.cancel()
+
     # cleanup (normally not reached unless WS loop exits)
     pipeline.set_state(Gst.State.NULL)
     glib_loop.quit()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop when installed (not on Windows), like publisher.main; passed as the
+    # loop factory since uvloop.install() is deprecated
+    loop_factory = None
+    if sys.platform != "win32":
+        try:
+            import uvloop
+
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            pass
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
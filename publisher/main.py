@@ -4,12 +4,46 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import collections
+import functools
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import socket
+import subprocess
+import sys
 import threading
-from typing import Any, Dict, Optional
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
 
 import websockets
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    import json
+
+    def jdump(obj: Any) -> bytes:
+        # Same compact UTF-8 bytes as orjson, so templated frames stay valid
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def jload(raw: Union[bytes, str]) -> Any:
+        return json.loads(raw)
+
+else:
+
+    def jdump(obj: Any) -> bytes:
+        # orjson emits compact UTF-8 bytes, which websockets sends as-is
+        return orjson.dumps(obj)
+
+    def jload(raw: Union[bytes, str]) -> Any:
+        return orjson.loads(raw)
+
 import gi
 
 gi.require_version("Gst", "1.0")
@@ -18,80 +52,615 @@ gi.require_version("GstSdp", "1.0")
 from gi.repository import GLib, Gst, GstSdp, GstWebRTC  # noqa: E402
 
 from .roku import RokuECP  # noqa: E402
+from .signaling import connect as signaling_connect  # noqa: E402
+
+# USE_VAAPI=1 moves MJPEG decode + color conversion onto the GPU (Intel/AMD VA-API)
+USE_VAAPI = os.environ.get("USE_VAAPI") == "1"
+if USE_VAAPI:
+    # Read when the VA display is opened, so these must be set before Gst.init
+    os.environ.setdefault("GST_GL_API", "gles2")
+    os.environ.setdefault("LIBVA_DRIVER_NAME", "iHD")
 
 Gst.init(None)
 
+log = logging.getLogger("publisher")
+
 STUN_SERVER = "stun://stun.l.google.com:19302"
 
+# GPU buffer memory tried (in order) between VA-API decode and encode
+VAAPI_ZERO_COPY_MEMORY = ("DMABuf", "VASurface")
+
+# A repeated viewer-ready within this window re-sends the pending offer instead
+# of renegotiating
+OFFER_CACHE_TTL_S = 30.0
+
+# Outgoing signaling frames buffered per connection before the oldest are dropped
+OUTBOX_MAXSIZE = 1024
 
-def jdump(obj: Any) -> str:
-    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+# Signaling socket write buffer (high, low) watermarks: above `high`, ws.send()
+# waits until the buffer drains below `low`, so a slow link backs up into the
+# bounded outbox instead of growing the transport buffer
+SIGNALING_WRITE_LIMIT = (256 * 1024, 64 * 1024)
 
+# Per-subscriber tee -> webrtcbin queue depth; older data is dropped beyond it
+VIDEO_QUEUE_MAX_TIME_MS = 200
+AUDIO_QUEUE_MAX_TIME_MS = 100
 
-async def send_json(ws, msg: Dict[str, Any]) -> None:
-    await ws.send(jdump(msg))
+# Trickled ICE candidates arriving within this window are sent as one frame
+CANDIDATE_BATCH_WINDOW_S = 0.01
 
+# Signaling reconnect delay: doubles per failed attempt up to the max (then +/-50%
+# jitter); reset once the server acks our hello
+RECONNECT_BACKOFF_MIN_S = 1.0
+RECONNECT_BACKOFF_MAX_S = 30.0
 
-def sdp_from_text(sdp_text: str) -> GstSdp.SDPMessage:
+
+# Constant frames, as literal bytes
+HELLO_PUBLISHER = b'{"type":"hello","role":"publisher"}'
+
+# Fixed-shape candidate frames are templated instead of built as dicts.
+# Strings are substituted as jdump() output, which is properly JSON-escaped.
+CANDIDATE_ITEM_TMPL = b'{"candidate":%b,"sdpMLineIndex":%d}'
+# Candidates frame = per-subscriber prefix (rendered once) + items + suffix
+CANDIDATES_PREFIX_TMPL = b'{"type":"candidates","subscriberId":%b,"items":['
+CANDIDATES_SUFFIX = b"]}"
+# A lone candidate goes out in the original single-candidate shape
+CANDIDATE_PREFIX_TMPL = b'{"type":"candidate","subscriberId":%b,"candidate":'
+CANDIDATE_SUFFIX = b"}"
+# Offer frame = per-subscriber prefix + JSON-escaped SDP + suffix
+OFFER_PREFIX_TMPL = b'{"type":"offer","subscriberId":%b,"sdp":{"type":"offer","sdp":'
+OFFER_SUFFIX = b"}}"
+CONTROL_STATUS_TMPL = b'{"type":"control-status","payload":%b}'
+
+
+def sdp_from_text(sdp: Union[str, bytes]) -> GstSdp.SDPMessage:
+    """
+    Parse SDP. str goes through new_from_text (GStreamer 1.16+), which parses the
+    C string GI hands over, with no Python-side encode; bytes use parse_buffer.
+    """
+    if isinstance(sdp, str):
+        _res, msg = GstSdp.SDPMessage.new_from_text(sdp)
+        return msg
     _res, msg = GstSdp.SDPMessage.new()
-    GstSdp.sdp_message_parse_buffer(sdp_text.encode("utf-8"), msg)
+    GstSdp.sdp_message_parse_buffer(sdp, msg)
     return msg
 
 
+def answer_from_text(sdp: Union[str, bytes]) -> GstWebRTC.WebRTCSessionDescription:
+    """SDP answer text -> session description ready for set-remote-description"""
+    return GstWebRTC.WebRTCSessionDescription.new(
+        GstWebRTC.WebRTCSDPType.ANSWER, sdp_from_text(sdp)
+    )
+
+
+RTP_VIDEO_CAPS = (
+    "application/x-rtp,media=video,encoding-name=H264,payload=96,clock-rate=90000"
+)
+RTP_AUDIO_CAPS = (
+    "application/x-rtp,media=audio,encoding-name=OPUS,payload=111,clock-rate=48000"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def caps(desc: str) -> Gst.Caps:
+    """Parsed caps, cached: Gst.Caps.from_string runs a full GstStructure parse"""
+    return Gst.Caps.from_string(desc)
+
+
+def make_element(
+    factory: str, name: Optional[str] = None, **props: Any
+) -> Gst.Element:
+    """
+    Gst.ElementFactory.make + properties. Values are applied gst-launch style
+    (underscores become dashes, enums by nick), e.g. speed_preset="ultrafast".
+    """
+    elem = Gst.ElementFactory.make(factory, name)
+    if elem is None:
+        raise RuntimeError(f"missing GStreamer element: {factory}")
+    for key, value in props.items():
+        Gst.util_set_object_arg(elem, key.replace("_", "-"), str(value))
+    return elem
+
+
+def capsfilter(desc: str) -> Gst.Element:
+    elem = make_element("capsfilter")
+    elem.set_property("caps", caps(desc))
+    return elem
+
+
+def add_and_link(pipeline: Gst.Pipeline, elements: list[Gst.Element]) -> None:
+    """Add elements to the pipeline and link them in order"""
+    for elem in elements:
+        pipeline.add(elem)
+    for up, down in zip(elements, elements[1:]):
+        if not up.link(down):
+            raise RuntimeError(f"failed to link {up.get_name()} -> {down.get_name()}")
+
+
+def have_vaapi_h264enc() -> bool:
+    return Gst.ElementFactory.find("vaapih264enc") is not None
+
+
+# --encoder choices; "auto" picks the first hardware encoder installed
+# (VA-API, then V4L2 M2M), x264 otherwise
+H264_ENCODERS = ("auto", "x264", "vaapi", "v4l2", "nvenc")
+
+
+def resolve_encoder(encoder: str) -> str:
+    if encoder != "auto":
+        return encoder
+    if have_vaapi_h264enc():
+        return "vaapi"
+    if Gst.ElementFactory.find("v4l2h264enc") is not None:
+        return "v4l2"
+    return "x264"
+
+
+X264_PRESETS = (
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+)
+
+
+@dataclass(frozen=True)
+class EncoderSettings:
+    """Encoder choice + x264 tuning (hashable: part of the source pipeline key)"""
+
+    name: str = "auto"  # one of H264_ENCODERS
+    preset: str = "ultrafast"  # x264 speed-preset
+    threads: int = 4  # x264 threads; with sliced-threads, slices per frame
+
+
+def jpeg_decode_elements(
+    w: str, h: str, memory: Optional[str] = None
+) -> list[Gst.Element]:
+    """
+    MJPEG -> raw video; decode + color-convert run on the GPU when USE_VAAPI is set.
+    With `memory` ("DMABuf"/"VASurface") frames stay in GPU memory for a VA-API
+    encoder instead of being downloaded to system memory.
+    """
+    if USE_VAAPI:
+        if memory:
+            out = f"video/x-raw(memory:{memory}),format=NV12,width={w},height={h}"
+        else:
+            out = "video/x-raw,format=NV12"
+        return [
+            make_element("vaapijpegdec"),
+            make_element("vaapipostproc"),
+            capsfilter(out),
+        ]
+    # v4l2jpegdec is the SoC's hardware JPEG block (RPi, Jetson, some Intel)
+    decoder = "v4l2jpegdec" if Gst.ElementFactory.find("v4l2jpegdec") else "jpegdec"
+    return [
+        make_element(decoder),
+        make_element("videoconvert"),
+        capsfilter("video/x-raw,format=I420"),
+    ]
+
+
+def h264_output_caps(settings: EncoderSettings) -> str:
+    """
+    Caps pinned after the encoder. v4l2h264enc sets its profile control from the
+    downstream caps, so it gets constrained-baseline to keep h264_profile=1;
+    the others are negotiated down to plain baseline.
+    """
+    if resolve_encoder(settings.name) == "v4l2":
+        return "video/x-h264,profile=constrained-baseline"
+    return "video/x-h264,profile=baseline"
+
+
+def h264_encoder_element(
+    fps: int, settings: EncoderSettings = EncoderSettings()
+) -> Gst.Element:
+    """
+    H.264 encoder for `settings.name` (see H264_ENCODERS): VA-API (Intel/AMD),
+    V4L2 M2M (Raspberry Pi, Jetson, other SoCs), NVENC or software x264. All
+    produce CBR 2500 kbps with a 1s keyframe interval.
+    """
+    encoder = resolve_encoder(settings.name)
+    if encoder == "vaapi":
+        return make_element(
+            "vaapih264enc",
+            rate_control="cbr",
+            bitrate=2500,
+            keyframe_period=fps,
+            tune="low-power",
+        )
+    if encoder == "v4l2":
+        # profile 1 = constrained baseline (what browsers negotiate), level 11 = 3.1
+        return make_element(
+            "v4l2h264enc",
+            extra_controls="controls,h264_profile=1,h264_level=11,"
+            f"video_bitrate=2500000,h264_i_frame_period={fps}",
+        )
+    if encoder == "nvenc":
+        return make_element(
+            "nvh264enc",
+            preset="low-latency-hq",
+            rc_mode="cbr",
+            bitrate=2500,
+            gop_size=fps,
+        )
+    # ultrafast + no lookahead: far cheaper than veryfast at a fixed 2500 kbps CBR,
+    # for a small quality-per-bit loss that is the right trade for LAN WebRTC.
+    # Sliced threads split each frame across cores instead of pipelining frames
+    # (no added frame latency); a 600 ms VBV keeps the CBR output smooth.
+    return make_element(
+        "x264enc",
+        tune="zerolatency",
+        speed_preset=settings.preset,
+        bitrate=2500,
+        vbv_buf_capacity=600,
+        key_int_max=fps,
+        bframes=0,
+        b_adapt=False,
+        rc_lookahead=0,
+        threads=settings.threads,
+        sliced_threads=True,
+        byte_stream=True,
+        aud=True,
+        option_string="no-scenecut=1:sync-lookahead=0",
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def device_formats(video_dev: str) -> frozenset[str]:
+    """FourCCs the capture device advertises, per v4l2-ctl (empty if unknown)"""
+    try:
+        res = subprocess.run(
+            ["v4l2-ctl", "--device", video_dev, "--list-formats-ext"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    # e.g. "[0]: 'MJPG' (Motion-JPEG, compressed)"
+    return frozenset(re.findall(r"'(\w{4})'", res.stdout))
+
+
+def device_supports_h264(video_dev: str) -> bool:
+    """Whether the capture device can emit H.264 directly"""
+    return "H264" in device_formats(video_dev)
+
+
+# Raw capture formats (V4L2 FourCC -> GStreamer format), best first: NV12 is
+# what the hardware encoders take natively, so it usually needs no conversion
+RAW_CAPTURE_FORMATS = {"NV12": "NV12", "YU12": "I420", "YUYV": "YUY2"}
+
+
+def has_raw_format(video_dev: str) -> bool:
+    """False only if v4l2-ctl answered and listed none of RAW_CAPTURE_FORMATS"""
+    formats = device_formats(video_dev)
+    return not formats or bool(RAW_CAPTURE_FORMATS.keys() & formats)
+
+
+def raw_capture_elements(w: str, h: str, fps: int) -> list[Gst.Element]:
+    """
+    Uncompressed capture caps + conversion to NV12 (accepted by x264 and every
+    hardware encoder). v4l2convert runs on the SoC's converter/ISP where one
+    exists; videoconvert is a passthrough when the camera already gives NV12.
+    """
+    formats = ",".join(RAW_CAPTURE_FORMATS.values())
+    convert = "videoconvert"
+    if Gst.ElementFactory.find("v4l2convert") is not None:
+        convert = "v4l2convert"
+    return [
+        capsfilter(
+            f"video/x-raw,format={{{formats}}},"
+            f"width={w},height={h},framerate={fps}/1"
+        ),
+        make_element("queue"),
+        make_element(convert),
+        capsfilter("video/x-raw,format=NV12"),
+    ]
+
+
+def _assemble_source_pipeline(
+    video_dev: str,
+    w: str,
+    h: str,
+    fps: int,
+    audio_dev: Optional[str],
+    passthrough: bool,
+    memory: Optional[str],
+    encoder: EncoderSettings,
+    raw_capture: bool,
+) -> tuple[Gst.Pipeline, Gst.Element, Optional[Gst.Element]]:
+    pipeline = Gst.Pipeline.new("source")
+
+    src = make_element("v4l2src", device=video_dev)
+    if passthrough:
+        video = [
+            src,
+            capsfilter(f"video/x-h264,width={w},height={h},framerate={fps}/1"),
+            make_element("h264parse", config_interval=-1),
+        ]
+    elif raw_capture:
+        # Uncompressed frames straight from the camera: no JPEG decode at all
+        video = [
+            src,
+            *raw_capture_elements(w, h, fps),
+            h264_encoder_element(fps, encoder),
+            capsfilter(h264_output_caps(encoder)),
+        ]
+    else:
+        video = [
+            src,
+            capsfilter(f"image/jpeg,width={w},height={h},framerate={fps}/1"),
+            make_element("queue"),
+            *jpeg_decode_elements(w, h, memory),
+            h264_encoder_element(fps, encoder),
+            capsfilter(h264_output_caps(encoder)),
+        ]
+
+    # video source -> tee -> fakesink (fakesink allows pipeline to start without subscribers)
+    video_tee = make_element("tee", "video_tee")
+    add_and_link(
+        pipeline,
+        video
+        + [
+            make_element("rtph264pay", config_interval=1, pt=96),
+            capsfilter(RTP_VIDEO_CAPS),
+            video_tee,
+            make_element("queue"),
+            make_element("fakesink"),
+        ],
+    )
+
+    audio_tee = None
+    if audio_dev:
+        audio_tee = make_element("tee", "audio_tee")
+        add_and_link(
+            pipeline,
+            [
+                make_element("alsasrc", device=audio_dev),
+                make_element("queue"),
+                make_element("audioconvert"),
+                make_element("audioresample"),
+                make_element("opusenc", bitrate=64000),
+                make_element("rtpopuspay", pt=111),
+                capsfilter(RTP_AUDIO_CAPS),
+                audio_tee,
+                make_element("queue"),
+                make_element("fakesink"),
+            ],
+        )
+
+    return (pipeline, video_tee, audio_tee)
+
+
 def build_source_pipeline(
     video_dev: str,
     video_size: str,
     fps: int,
     audio_dev: Optional[str],
+    force_encode: bool = False,
+    encoder: EncoderSettings = EncoderSettings(),
+    raw_capture: bool = False,
 ) -> tuple[Gst.Pipeline, Gst.Element, Optional[Gst.Element]]:
     """
     Build a single source pipeline with tee elements for video (and optionally audio).
+    If the device outputs H.264 itself (and force_encode is off) it is packetized
+    as-is, skipping decode and re-encode entirely.
+    Elements are constructed directly (no parse_launch), so device names are
+    plain property values rather than part of a pipeline description.
     Returns (pipeline, video_tee, audio_tee)
     """
     w, h = video_size.split("x")
 
-    # Build video source -> tee -> fakesink (fakesink allows pipeline to start without subscribers)
-    video_desc = f"""
-      v4l2src device={video_dev} !
-        image/jpeg,width={w},height={h},framerate={fps}/1 !
-        queue !
-        jpegdec !
-        videoconvert !
-        video/x-raw,format=I420 !
-        x264enc tune=zerolatency speed-preset=veryfast bitrate=2500 key-int-max={fps} bframes=0 !
-        video/x-h264,profile=baseline !
-        rtph264pay config-interval=1 pt=96 !
-        application/x-rtp,media=video,encoding-name=H264,payload=96 !
-        tee name=video_tee
-          video_tee. ! queue ! fakesink
+    passthrough = not force_encode and device_supports_h264(video_dev)
+    if passthrough:
+        log.info("%s supports H.264; using passthrough", video_dev)
+    elif raw_capture and not has_raw_format(video_dev):
+        log.warning("%s lists no raw NV12/I420/YUY2 format; using MJPEG", video_dev)
+        raw_capture = False
+
+    encoder = replace(encoder, name=resolve_encoder(encoder.name))
+    if not passthrough:
+        log.info("encoding with %s", encoder.name)
+
+    # VA-API decode -> VA-API encode: keep frames in GPU memory (zero-copy),
+    # falling back to the next memory type if the encoder refuses to link.
+    memories: tuple[Optional[str], ...] = (None,)
+    if USE_VAAPI and not passthrough and not raw_capture and encoder.name == "vaapi":
+        memories = VAAPI_ZERO_COPY_MEMORY
+
+    assemble = functools.partial(
+        _assemble_source_pipeline,
+        video_dev,
+        w,
+        h,
+        fps,
+        audio_dev,
+        passthrough,
+        encoder=encoder,
+        raw_capture=raw_capture,
+    )
+    for memory in memories[:-1]:
+        try:
+            return assemble(memory=memory)
+        except RuntimeError as e:
+            log.warning("memory:%s rejected (%s); retrying", memory, e)
+    return assemble(memory=memories[-1])
+
+
+# (video_dev, video_size, fps, audio_dev, force_encode, encoder, raw_capture)
+#   -> built source pipeline
+_source_pipelines: Dict[
+    tuple[str, str, int, Optional[str], bool, EncoderSettings, bool],
+    tuple[Gst.Pipeline, Gst.Element, Optional[Gst.Element]],
+] = {}
+
+
+def get_source_pipeline(
+    video_dev: str,
+    video_size: str,
+    fps: int,
+    audio_dev: Optional[str],
+    force_encode: bool = False,
+    encoder: EncoderSettings = EncoderSettings(),
+    raw_capture: bool = False,
+) -> tuple[Gst.Pipeline, Gst.Element, Optional[Gst.Element]]:
     """
+    Memoized build_source_pipeline. Signaling reconnects reuse the already-parsed
+    pipeline (stopped to NULL in between) and only recreate per-subscriber webrtcbins.
+    """
+    key = (video_dev, video_size, fps, audio_dev, force_encode, encoder, raw_capture)
+    cached = _source_pipelines.get(key)
+    if cached:
+        return cached
+
+    cached = build_source_pipeline(*key)
+    pipeline = cached[0]
+
+    # Bus handling (once per pipeline). A sync handler sees each message on the
+    # posting thread and drops it there, so the GLib loop no longer polls a bus
+    # GSource for the state-change/QoS chatter; only errors and warnings are
+    # handed over to it.
+    bus = pipeline.get_bus()
+    if bus:
+
+        def log_bus_message(message: Gst.Message) -> bool:
+            if message.type == Gst.MessageType.ERROR:
+                err, dbg = message.parse_error()
+                log.error("source pipeline: %s (%s)", err, dbg)
+            else:
+                err, dbg = message.parse_warning()
+                log.warning("source pipeline: %s (%s)", err, dbg)
+            return False
 
-    audio_tee = None
-    if audio_dev:
-        audio_desc = f"""
-          alsasrc device={audio_dev} !
-            queue !
-            audioconvert ! audioresample !
-            opusenc bitrate=64000 !
-            rtpopuspay pt=111 !
-            application/x-rtp,media=audio,encoding-name=OPUS,payload=111 !
-            tee name=audio_tee
-              audio_tee. ! queue ! fakesink
-        """
-        desc = video_desc + "\n      " + audio_desc
-    else:
-        desc = video_desc
+        def on_bus_sync(_bus, message):
+            if message.type in (Gst.MessageType.ERROR, Gst.MessageType.WARNING):
+                GLib.idle_add(log_bus_message, message)
+            return Gst.BusSyncReply.DROP
 
-    pipeline = Gst.parse_launch(desc)
-    video_tee_elem = pipeline.get_by_name("video_tee")
-    assert video_tee_elem is not None
+        bus.set_sync_handler(on_bus_sync)
 
-    if audio_dev:
-        audio_tee_elem = pipeline.get_by_name("audio_tee")
-        assert audio_tee_elem is not None
-        audio_tee = audio_tee_elem
+    _source_pipelines[key] = cached
+    return cached
+
+
+def tune_signaling_socket(ws) -> None:
+    """
+    Disable Nagle (small control/candidate frames must not wait for ACK
+    coalescing) and enlarge the send buffer on the signaling TCP socket.
+    """
+    sock = ws.transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+    except OSError as e:
+        log.warning("could not tune signaling socket: %s", e)
+
+
+class SignalingOutbox:
+    """
+    Single writer for the signaling WebSocket. Messages may be posted from any
+    thread as dicts (or pre-built bytes frames); they are serialized and sent by
+    one task on the asyncio loop, so a slow socket never stalls message handling.
+    When the buffer is full the oldest queued message is dropped.
+
+    Producers append to a deque (atomic under the GIL) and only poke the loop
+    when the writer isn't already due to wake, so a burst from the GStreamer
+    thread costs one cross-thread wakeup rather than one per frame.
+    """
+
+    def __init__(self, ws, aio_loop: asyncio.AbstractEventLoop) -> None:
+        self._ws = ws
+        self._aio_loop = aio_loop
+        self._queue: collections.deque[Union[Dict[str, Any], bytes]] = (
+            collections.deque(maxlen=OUTBOX_MAXSIZE)
+        )
+        self._wakeup = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task[None]] = None
+        # Bound once: post() runs for every frame on the GStreamer threads
+        self._call_soon_threadsafe = aio_loop.call_soon_threadsafe
+        self._wakeup_set = self._wakeup.set
 
-    return (pipeline, video_tee_elem, audio_tee)
+    def start(self) -> None:
+        self._writer_task = self._aio_loop.create_task(self._writer())
+
+    def stop(self) -> None:
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+
+    def _append(self, msg: Union[Dict[str, Any], bytes]) -> None:
+        if len(self._queue) == OUTBOX_MAXSIZE:
+            log.warning("outbox full; dropped oldest frame")
+        self._queue.append(msg)  # maxlen deque evicts the oldest
+
+    def post(self, msg: Union[Dict[str, Any], bytes]) -> None:
+        """Queue a message from a GStreamer/GLib thread"""
+        self._append(msg)
+        # Appended before the check: if the event still reads set, the writer
+        # has yet to clear it and will drain this frame in the same pass.
+        if not self._wakeup.is_set():
+            self._call_soon_threadsafe(self._wakeup_set)
+
+    def post_nowait(self, msg: Union[Dict[str, Any], bytes]) -> None:
+        """Queue a message from the asyncio loop thread"""
+        self._append(msg)
+        self._wakeup.set()
+
+    async def _writer(self) -> None:
+        queue = self._queue
+        wakeup = self._wakeup
+        send = self._ws.send
+        while True:
+            # Wake once per burst, then write everything queued back-to-back
+            await wakeup.wait()
+            wakeup.clear()
+            while queue:
+                msg = queue.popleft()
+                try:
+                    await send(msg if isinstance(msg, bytes) else jdump(msg))
+                except websockets.ConnectionClosed:
+                    # the receive loop notices the close and tears everything down
+                    return
+                except Exception as e:
+                    log.error("failed to send signaling frame: %s", e)
+
+
+def leaky_queue(name: str, max_time_ms: int) -> Gst.Element:
+    """
+    Queue bounded by time only (the tee carries RTP packets, so buffer counts
+    don't map to frames) that drops its oldest data when full.
+    """
+    return make_element(
+        "queue",
+        name,
+        max_size_buffers=0,
+        max_size_bytes=0,
+        max_size_time=max_time_ms * Gst.MSECOND,
+        leaky="downstream",
+    )
+
+
+def pin_transceiver(webrtc_sink: Gst.Pad, rtp_caps: str) -> None:
+    """
+    Make the transceiver behind a webrtcbin sink pad send-only and offer exactly
+    the already-payloaded RTP format coming from the tee. The shared stream is
+    then forwarded as-is to every peer, with no codec/PT renegotiation.
+    """
+    transceiver = webrtc_sink.get_property("transceiver")
+    if transceiver is None:
+        return
+    transceiver.set_property(
+        "direction", GstWebRTC.WebRTCRTPTransceiverDirection.SENDONLY
+    )
+    transceiver.set_property("codec-preferences", caps(rtp_caps))
+
+
+# Element-name suffixes for warm connections that have no subscriber_id yet
+_warm_ids = itertools.count()
 
 
 class SubscriberConnection:
@@ -99,21 +668,63 @@ class SubscriberConnection:
     Manages a single subscriber's WebRTC connection (webrtcbin connected to shared source)
     """
 
+    # Fixed attribute set: no per-instance __dict__, cheaper attribute access in
+    # the GStreamer callbacks
+    __slots__ = (
+        "subscriber_id",
+        "_tag",
+        "_bind_lock",
+        "_offer_wanted",
+        "_source_pipeline",
+        "_video_tee",
+        "_audio_tee",
+        "_call_soon_threadsafe",
+        "_call_later",
+        "_post",
+        "_post_nowait",
+        "_webrtc",
+        "_video_queue",
+        "_audio_queue",
+        "_video_tee_src_pad",
+        "_audio_tee_src_pad",
+        "_making_offer",
+        "_have_remote_answer",
+        "_last_offer_frame",
+        "_last_offer_ts",
+        "_cand_queue",
+        "_cand_lock",
+        "_cand_flush_scheduled",
+        "_cand_prefix",
+        "_single_cand_prefix",
+        "_offer_prefix",
+    )
+
     def __init__(
         self,
-        subscriber_id: str,
+        subscriber_id: Optional[str],
         source_pipeline: Gst.Pipeline,
         video_tee: Gst.Element,
         audio_tee: Optional[Gst.Element],
         aio_loop: asyncio.AbstractEventLoop,
-        ws,
+        outbox: SignalingOutbox,
     ) -> None:
-        self.subscriber_id = subscriber_id
+        """
+        subscriber_id=None builds a warm (pooled) connection: start() wires it up
+        but the offer is held back until bind() assigns a subscriber.
+        """
+        self.subscriber_id: Optional[str] = None
+        # Unique element-name suffix within the shared pipeline
+        self._tag = subscriber_id or f"warm{next(_warm_ids)}"
+        self._bind_lock = threading.Lock()
+        self._offer_wanted = False
         self._source_pipeline = source_pipeline
         self._video_tee = video_tee
         self._audio_tee = audio_tee
-        self._aio_loop = aio_loop
-        self._ws = ws
+        # Bound methods cached once for the per-candidate / per-frame paths
+        self._call_soon_threadsafe = aio_loop.call_soon_threadsafe
+        self._call_later = aio_loop.call_later
+        self._post = outbox.post
+        self._post_nowait = outbox.post_nowait
 
         self._webrtc: Optional[Gst.Element] = None
         self._video_queue: Optional[Gst.Element] = None
@@ -122,65 +733,90 @@ class SubscriberConnection:
         self._audio_tee_src_pad: Optional[Gst.Pad] = None
         self._making_offer = False
         self._have_remote_answer = False
+        self._last_offer_frame: Optional[bytes] = None
+        self._last_offer_ts = 0.0
+
+        # (mlineindex, candidate) pairs waiting to be flushed as one WS frame
+        self._cand_queue: collections.deque[tuple[int, str]] = collections.deque()
+        self._cand_lock = threading.Lock()
+        self._cand_flush_scheduled = False
+        self._cand_prefix = b""
+        self._single_cand_prefix = b""
+        self._offer_prefix = b""
+        if subscriber_id is not None:
+            self._set_subscriber_id(subscriber_id)
+
+    def _set_subscriber_id(self, subscriber_id: str) -> None:
+        self.subscriber_id = subscriber_id
+        self._cand_prefix = CANDIDATES_PREFIX_TMPL % jdump(subscriber_id)
+        self._single_cand_prefix = CANDIDATE_PREFIX_TMPL % jdump(subscriber_id)
+        self._offer_prefix = OFFER_PREFIX_TMPL % jdump(subscriber_id)
+
+    def bind(self, subscriber_id: str) -> None:
+        """Hand a warm connection to a subscriber and send the held-back offer"""
+        with self._bind_lock:
+            self._set_subscriber_id(subscriber_id)
+            wanted, self._offer_wanted = self._offer_wanted, False
+        if wanted:
+            self._create_offer()
 
     def start(self) -> None:
         """Create webrtcbin and connect it to the shared source tee"""
         # Create webrtcbin
-        self._webrtc = Gst.ElementFactory.make(
-            "webrtcbin", f"webrtc_{self.subscriber_id}"
-        )
+        self._webrtc = Gst.ElementFactory.make("webrtcbin", f"webrtc_{self._tag}")
         if not self._webrtc:
-            print(f"[gst-{self.subscriber_id}] failed to create webrtcbin")
+            log.error("[%s] failed to create webrtcbin", self._tag)
             return
 
         self._webrtc.set_property("bundle-policy", 1)  # max-bundle
         self._webrtc.set_property("stun-server", STUN_SERVER)
+        # Send-only peer: no reason to hold anything in rtpbin's jitterbuffers
+        self._webrtc.set_property("latency", 0)
 
         # Add webrtcbin to source pipeline
         self._source_pipeline.add(self._webrtc)
 
-        # Create queue for video RTP stream
-        video_queue = Gst.ElementFactory.make(
-            "queue", f"video_queue_{self.subscriber_id}"
-        )
+        # Create queue for video RTP stream (leaky: a stalled peer drops its own
+        # packets instead of blocking the tee for every other subscriber)
+        video_queue = leaky_queue(f"video_queue_{self._tag}", VIDEO_QUEUE_MAX_TIME_MS)
         self._source_pipeline.add(video_queue)
 
         # Request src pad from video tee and link to queue
         self._video_tee_src_pad = self._video_tee.get_request_pad("src_%u")
         video_queue_sink = video_queue.get_static_pad("sink")
         if self._video_tee_src_pad.link(video_queue_sink) != Gst.PadLinkReturn.OK:
-            print(f"[gst-{self.subscriber_id}] failed to link video tee to queue")
+            log.error("[%s] failed to link video tee to queue", self._tag)
             return
 
         # Link queue to webrtcbin sink pad
         video_queue_src = video_queue.get_static_pad("src")
         webrtc_video_sink = self._webrtc.get_request_pad("sink_%u")
         if video_queue_src.link(webrtc_video_sink) != Gst.PadLinkReturn.OK:
-            print(f"[gst-{self.subscriber_id}] failed to link video queue to webrtcbin")
+            log.error("[%s] failed to link video queue to webrtcbin", self._tag)
             return
+        pin_transceiver(webrtc_video_sink, RTP_VIDEO_CAPS)
 
         self._video_queue = video_queue
 
         # Do the same for audio if available
         if self._audio_tee:
-            audio_queue = Gst.ElementFactory.make(
-                "queue", f"audio_queue_{self.subscriber_id}"
+            audio_queue = leaky_queue(
+                f"audio_queue_{self._tag}", AUDIO_QUEUE_MAX_TIME_MS
             )
             self._source_pipeline.add(audio_queue)
 
             self._audio_tee_src_pad = self._audio_tee.get_request_pad("src_%u")
             audio_queue_sink = audio_queue.get_static_pad("sink")
             if self._audio_tee_src_pad.link(audio_queue_sink) != Gst.PadLinkReturn.OK:
-                print(f"[gst-{self.subscriber_id}] failed to link audio tee to queue")
+                log.error("[%s] failed to link audio tee to queue", self._tag)
                 return
 
             audio_queue_src = audio_queue.get_static_pad("src")
             webrtc_audio_sink = self._webrtc.get_request_pad("sink_%u")
             if audio_queue_src.link(webrtc_audio_sink) != Gst.PadLinkReturn.OK:
-                print(
-                    f"[gst-{self.subscriber_id}] failed to link audio queue to webrtcbin"
-                )
+                log.error("[%s] failed to link audio queue to webrtcbin", self._tag)
                 return
+            pin_transceiver(webrtc_audio_sink, RTP_AUDIO_CAPS)
 
             self._audio_queue = audio_queue
 
@@ -192,72 +828,125 @@ class SubscriberConnection:
 
         # Note: Bus messages are handled by the main source pipeline
 
-        # ICE candidates from GStreamer -> WS
+        # ICE candidates from GStreamer -> WS (batched, see _flush_candidates).
+        # Runs once per candidate on a GStreamer thread: everything it touches
+        # except the scheduled flag is a closure cell, not an attribute lookup.
+        cand_lock = self._cand_lock
+        cand_append = self._cand_queue.append
+        call_soon_threadsafe = self._call_soon_threadsafe
+        schedule_flush = self._schedule_flush
+
         def on_ice_candidate(_webrtc, mlineindex, candidate):
-            msg = {
-                "type": "candidate",
-                "subscriberId": self.subscriber_id,
-                "candidate": {
-                    "candidate": candidate,
-                    "sdpMLineIndex": int(mlineindex),
-                },
-            }
-            loop = self._aio_loop
-            if loop:
-                asyncio.run_coroutine_threadsafe(self._ws.send(jdump(msg)), loop)
+            with cand_lock:
+                # mlineindex arrives as a Python int already (guint via GI)
+                cand_append((mlineindex, candidate))
+                if self._cand_flush_scheduled:
+                    return
+                self._cand_flush_scheduled = True
+            call_soon_threadsafe(schedule_flush)
 
         self._webrtc.connect("on-ice-candidate", on_ice_candidate)
 
-        # Offer creation callback
-        def on_offer_created(promise, _):
-            try:
-                promise.wait()
-                reply = promise.get_reply()
-                offer = reply.get_value("offer")
-                if offer is None:
-                    try:
-                        txt = reply.to_string()
-                    except Exception:
-                        txt = None
-                    print(
-                        f"[gst-{self.subscriber_id}] offer is None; promise reply:", txt
-                    )
-                    self._making_offer = False
-                    return
+        # Negotiation-needed from GStreamer
+        def on_negotiation_needed(_webrtc):
+            log.debug("[%s] on-negotiation-needed", self._tag)
+            self._request_offer()
 
-                # Set local description
-                self._webrtc.emit("set-local-description", offer, Gst.Promise.new())
+        self._webrtc.connect("on-negotiation-needed", on_negotiation_needed)
 
-                sdp_text = offer.sdp.as_text()
-                msg = {
-                    "type": "offer",
-                    "subscriberId": self.subscriber_id,
-                    "sdp": {"type": "offer", "sdp": sdp_text},
-                }
+        # Offer right away (held back until bind() for a warm connection)
+        self._request_offer()
 
-                loop = self._aio_loop
-                if loop:
-                    asyncio.run_coroutine_threadsafe(self._ws.send(jdump(msg)), loop)
-                print(f"[gst-{self.subscriber_id}] sent offer")
-            finally:
-                self._making_offer = False
+    def _request_offer(self) -> None:
+        with self._bind_lock:
+            if self.subscriber_id is None:
+                self._offer_wanted = True
+                return
+        self._create_offer()
 
-        def create_offer():
+    def _create_offer(self) -> None:
+        # bind() (asyncio thread) and on-negotiation-needed (GStreamer thread)
+        # can race here; only one of them may emit create-offer
+        with self._bind_lock:
             if self._making_offer:
                 return
             self._making_offer = True
-            promise = Gst.Promise.new_with_change_func(on_offer_created, None)
-            self._webrtc.emit("create-offer", None, promise)
+        promise = Gst.Promise.new_with_change_func(self._on_offer_created, None)
+        self._webrtc.emit("create-offer", None, promise)
 
-        # Negotiation-needed from GStreamer
-        def on_negotiation_needed(_webrtc):
-            print(f"[gst-{self.subscriber_id}] on-negotiation-needed")
-            create_offer()
+    def _on_offer_created(self, promise: Gst.Promise, _) -> None:
+        try:
+            promise.wait()
+            reply = promise.get_reply()
+            offer = reply.get_value("offer")
+            if offer is None:
+                try:
+                    txt = reply.to_string()
+                except Exception:
+                    txt = None
+                log.error(
+                    "[%s] offer is None; promise reply: %s", self.subscriber_id, txt
+                )
+                self._making_offer = False
+                return
 
-        self._webrtc.connect("on-negotiation-needed", on_negotiation_needed)
+            # Set local description (fire-and-forget: no reply promise)
+            self._webrtc.emit("set-local-description", offer, None)
+
+            # Only the SDP string is serialized; the envelope is pre-rendered
+            frame = self._offer_prefix + jdump(offer.sdp.as_text()) + OFFER_SUFFIX
+
+            self._last_offer_frame = frame
+            self._last_offer_ts = time.monotonic()
+
+            self._post(frame)
+            log.info("[%s] sent offer", self.subscriber_id)
+        finally:
+            self._making_offer = False
+
+    def resend_offer(self) -> bool:
+        """
+        Re-send the still-pending offer if it is recent, so a repeated viewer-ready
+        doesn't cost a fresh create-offer round. Returns False if a new
+        negotiation is needed instead.
+        """
+        frame = self._last_offer_frame
+        if frame is None or self._have_remote_answer:
+            return False
+        if time.monotonic() - self._last_offer_ts >= OFFER_CACHE_TTL_S:
+            return False
+        self._post_nowait(frame)
+        return True
 
-        # Immediately create offer for this subscriber
-        create_offer()
+    def _schedule_flush(self) -> None:
+        """Runs on the asyncio loop; flushes queued candidates after the window"""
+        self._call_later(CANDIDATE_BATCH_WINDOW_S, self._flush_candidates)
+
+    def _flush_candidates(self) -> None:
+        """
+        Drain every queued candidate into a single {type:"candidates", items:[...]}
+        frame, or a plain {type:"candidate"} frame when only one is queued.
+        """
+        with self._cand_lock:
+            pending = list(self._cand_queue)
+            self._cand_queue.clear()
+            self._cand_flush_scheduled = False
+
+        if not pending:
+            return
+        if len(pending) == 1:
+            mlineindex, candidate = pending[0]
+            self._post_nowait(
+                self._single_cand_prefix
+                + CANDIDATE_ITEM_TMPL % (jdump(candidate), mlineindex)
+                + CANDIDATE_SUFFIX
+            )
+            return
+        items = b",".join(
+            CANDIDATE_ITEM_TMPL % (jdump(candidate), mlineindex)
+            for mlineindex, candidate in pending
+        )
+        self._post_nowait(self._cand_prefix + items + CANDIDATES_SUFFIX)
 
     def stop(self) -> None:
         """Stop and cleanup this subscriber's webrtcbin and tee connections"""
@@ -306,46 +995,52 @@ class SubscriberConnection:
                 self._source_pipeline.remove(self._webrtc)
 
         except Exception as e:
-            print(f"[gst-{self.subscriber_id}] error stopping connection: {e}")
+            log.error("[%s] error stopping connection: %s", self._tag, e)
+        finally:
+            # Signals in flight (answer, candidates) check this before emitting
+            self._webrtc = None
 
-    def handle_answer(self, msg: Dict[str, Any]) -> None:
+    async def handle_answer(self, msg: Dict[str, Any]) -> None:
         """Handle SDP answer from subscriber"""
         if not self._webrtc:
             return
         sdp_obj = msg.get("sdp") or {}
         sdp_text = sdp_obj.get("sdp")
         if not sdp_text:
-            print(f"[gst-{self.subscriber_id}] answer missing sdp")
+            log.warning("[%s] answer missing sdp", self.subscriber_id)
             return
 
-        sdpmsg = sdp_from_text(sdp_text)
-        answer = GstWebRTC.WebRTCSessionDescription.new(
-            GstWebRTC.WebRTCSDPType.ANSWER, sdpmsg
-        )
-
-        def _do():
-            self._webrtc.emit("set-remote-description", answer, Gst.Promise.new())
-            self._have_remote_answer = True
-            print(f"[gst-{self.subscriber_id}] set remote description (answer)")
-            return False
+        # Parsing + description construction run in a worker thread so a large
+        # answer doesn't stall the signaling loop (GI releases the GIL in C calls)
+        answer = await asyncio.to_thread(answer_from_text, sdp_text)
+        webrtc = self._webrtc
+        if webrtc is None:
+            # subscriber went away while the answer was being parsed
+            return
 
-        GLib.idle_add(_do)
+        # webrtcbin action signals are thread-safe (queued onto its own task
+        # thread), so no GLib main loop hop is needed
+        webrtc.emit("set-remote-description", answer, None)
+        self._have_remote_answer = True
+        log.info("[%s] set remote description (answer)", self.subscriber_id)
 
     def handle_candidate(self, msg: Dict[str, Any]) -> None:
-        """Handle ICE candidate from subscriber"""
+        """Handle ICE candidate(s) from subscriber: 'candidate' or batched 'candidates'"""
         if not self._webrtc:
             return
-        c = msg.get("candidate") or {}
-        cand = c.get("candidate")
-        mline = c.get("sdpMLineIndex")
-        if cand is None or mline is None:
-            return
-
-        def _do():
-            self._webrtc.emit("add-ice-candidate", int(mline), cand)
-            return False
-
-        GLib.idle_add(_do)
+        items = msg.get("items")
+        if not isinstance(items, list):
+            items = (msg.get("candidate"),)
+        for c in items:
+            if not isinstance(c, dict):
+                continue
+            cand = c.get("candidate")
+            mline = c.get("sdpMLineIndex")
+            # Subscriber-supplied JSON: skip anything emit() would reject
+            if not isinstance(cand, str) or not isinstance(mline, int):
+                log.debug("ignoring malformed candidate %r", c)
+                continue
+            self._webrtc.emit("add-ice-candidate", mline, cand)
 
 
 class GstWebRTCPublisher:
@@ -359,71 +1054,91 @@ class GstWebRTCPublisher:
         video_size: str,
         framerate: int,
         audio_device: Optional[str],
+        force_encode: bool = False,
+        run_glib_loop: bool = True,
+        encoder: EncoderSettings = EncoderSettings(),
+        raw_capture: bool = False,
+        warm_subscribers: int = 0,
     ) -> None:
         self.video_device = video_device
         self.video_size = video_size
         self.framerate = framerate
         self.audio_device = audio_device
+        self.force_encode = force_encode
+        self.encoder = encoder
+        self.raw_capture = raw_capture
+        # Pre-built, already-linked webrtcbins kept ready for new viewers
+        self.warm_subscribers = warm_subscribers
+        # False when the asyncio loop already drives GLib's default context
+        self.run_glib_loop = run_glib_loop
 
         self._glib_loop: Optional[GLib.MainLoop] = None
         self._source_pipeline: Optional[Gst.Pipeline] = None
         self._video_tee: Optional[Gst.Element] = None
         self._audio_tee: Optional[Gst.Element] = None
-        self._ws = None
+        self._outbox: Optional[SignalingOutbox] = None
         self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Map subscriber_id -> SubscriberConnection
         self._subscribers: Dict[str, SubscriberConnection] = {}
-
-    def start(self, aio_loop: asyncio.AbstractEventLoop, ws) -> None:
+        # Warm connections not yet bound to a subscriber (filled on the GLib thread)
+        # Filled on the GLib thread, drained on the asyncio thread; _warm_lock
+        # guards it together with _stopped
+        self._warm: collections.deque[SubscriberConnection] = collections.deque()
+        self._warm_lock = threading.Lock()
+        self._stopped = False
+        # Strong refs to in-flight answer tasks (the loop only keeps weak ones)
+        self._answer_tasks: set[asyncio.Task[None]] = set()
+
+    def start(
+        self, aio_loop: asyncio.AbstractEventLoop, outbox: SignalingOutbox
+    ) -> None:
         """
-        Start GLib main loop thread and create the shared source pipeline.
-        Subscriber connections are added on-demand.
+        Start GLib main loop thread (unless asyncio is GLib-backed) and create the
+        shared source pipeline. Subscriber connections are added on-demand.
         """
         self._aio_loop = aio_loop
-        self._ws = ws
+        self._outbox = outbox
 
         # Run GLib loop in background thread
-        self._glib_loop = GLib.MainLoop()
-        threading.Thread(target=self._glib_loop.run, daemon=True).start()
+        if self.run_glib_loop:
+            self._glib_loop = GLib.MainLoop()
+            threading.Thread(target=self._glib_loop.run, daemon=True).start()
 
-        # Build and start the shared source pipeline
+        # Build (once per process) and start the shared source pipeline
         def _do():
             self._source_pipeline, self._video_tee, self._audio_tee = (
-                build_source_pipeline(
+                get_source_pipeline(
                     self.video_device,
                     self.video_size,
                     self.framerate,
                     self.audio_device,
+                    self.force_encode,
+                    self.encoder,
+                    self.raw_capture,
                 )
             )
 
-            # Set up bus message handling
-            bus = self._source_pipeline.get_bus()
-            if bus:
-                bus.add_signal_watch()
-
-                def on_bus_message(_bus, message):
-                    t = message.type
-                    if t == Gst.MessageType.ERROR:
-                        err, dbg = message.parse_error()
-                        print("[gst-source] ERROR:", err, dbg)
-                    elif t == Gst.MessageType.WARNING:
-                        err, dbg = message.parse_warning()
-                        print("[gst-source] WARNING:", err, dbg)
-
-                bus.connect("message", on_bus_message)
-
             self._source_pipeline.set_state(Gst.State.PLAYING)
-            print("[publisher] source pipeline started")
+            log.info("source pipeline started")
+            self._fill_warm_pool()
             return False
 
-        GLib.idle_add(_do)
+        GLib.idle_add(_do, priority=GLib.PRIORITY_HIGH)
 
     def stop(self) -> None:
         """Stop all subscriber connections, source pipeline, and GLib loop"""
-        # Stop all subscriber connections
-        for sub in list(self._subscribers.values()):
+        with self._warm_lock:
+            self._stopped = True
+            warm = list(self._warm)
+            self._warm.clear()
+        # Answers still being parsed would target webrtcbins torn down below
+        for task in self._answer_tasks:
+            task.cancel()
+        self._answer_tasks.clear()
+
+        # Stop all subscriber connections, bound and warm
+        for sub in [*self._subscribers.values(), *warm]:
             try:
                 sub.stop()
             except Exception:
@@ -446,73 +1161,219 @@ class GstWebRTCPublisher:
 
     def create_subscriber_connection(self, subscriber_id: str) -> None:
         """Create a new webrtcbin connection for a subscriber"""
-        if subscriber_id in self._subscribers:
-            print(f"[publisher] subscriber {subscriber_id} already exists")
+        existing = self._subscribers.get(subscriber_id)
+        if existing:
+            if existing.resend_offer():
+                log.info("re-sent cached offer to %s", subscriber_id)
+            else:
+                log.info("subscriber %s already exists", subscriber_id)
             return
 
-        if not self._source_pipeline or not self._video_tee:
-            print(
-                f"[publisher] source pipeline not ready, cannot create connection for {subscriber_id}"
+        if not self._source_pipeline or not self._video_tee or not self._outbox:
+            log.warning(
+                "source pipeline not ready, cannot create connection for %s",
+                subscriber_id,
             )
             return
 
-        print(f"[publisher] creating connection for subscriber {subscriber_id}")
+        with self._warm_lock:
+            warm = self._warm.popleft() if self._warm else None
+        if warm is not None:
+            log.info("binding warm connection for subscriber %s", subscriber_id)
+            self._subscribers[subscriber_id] = warm
+            warm.bind(subscriber_id)
+            # Top the pool back up once the GLib loop has nothing better to do
+            GLib.idle_add(self._fill_warm_pool)
+            return
+
+        log.info("creating connection for subscriber %s", subscriber_id)
         sub = SubscriberConnection(
             subscriber_id=subscriber_id,
             source_pipeline=self._source_pipeline,
             video_tee=self._video_tee,
             audio_tee=self._audio_tee,
             aio_loop=self._aio_loop,
-            ws=self._ws,
+            outbox=self._outbox,
         )
         self._subscribers[subscriber_id] = sub
 
-        # Start connection on GLib thread
+        # Start connection on GLib thread, ahead of default-priority sources
         def _do():
             sub.start()
             return False
 
-        GLib.idle_add(_do)
+        GLib.idle_add(_do, priority=GLib.PRIORITY_HIGH)
+
+    def _fill_warm_pool(self) -> bool:
+        """
+        GLib thread: build warm connections up to `warm_subscribers`. Used
+        webrtcbins are never recycled (their ICE/DTLS state can't be reset), so
+        the pool is refilled with fresh ones instead.
+        """
+        aio_loop, outbox = self._aio_loop, self._outbox
+        if (
+            not self._source_pipeline
+            or not self._video_tee
+            or aio_loop is None
+            or outbox is None
+        ):
+            return False
+        while True:
+            with self._warm_lock:
+                if self._stopped or len(self._warm) >= self.warm_subscribers:
+                    return False
+            sub = SubscriberConnection(
+                subscriber_id=None,
+                source_pipeline=self._source_pipeline,
+                video_tee=self._video_tee,
+                audio_tee=self._audio_tee,
+                aio_loop=aio_loop,
+                outbox=outbox,
+            )
+            sub.start()
+            with self._warm_lock:
+                if not self._stopped:
+                    self._warm.append(sub)
+                    continue
+            # stop() ran while this one was being built
+            sub.stop()
+            return False
 
     def remove_subscriber_connection(self, subscriber_id: str) -> None:
         """Remove a subscriber's connection"""
         sub = self._subscribers.pop(subscriber_id, None)
         if sub:
-            print(f"[publisher] removing connection for subscriber {subscriber_id}")
+            log.info("removing connection for subscriber %s", subscriber_id)
             try:
                 sub.stop()
             except Exception:
                 pass
 
+    def handle_peer(self, msg: Dict[str, Any]) -> None:
+        """
+        Signaling server connection events:
+        {type:"peer", event:"connected"|"disconnected", role, subscriberId?}
+        """
+        subscriber_id = msg.get("subscriberId")
+        if msg.get("role") != "subscriber" or not subscriber_id:
+            return
+        event = msg.get("event")
+        if event == "connected":
+            # Subscriber connected - wait for viewer-ready message to create connection
+            log.info("subscriber %s connected", subscriber_id)
+        elif event == "disconnected":
+            self.remove_subscriber_connection(subscriber_id)
+
+    def handle_viewer_ready(self, msg: Dict[str, Any]) -> None:
+        """Subscriber is ready - create (or re-offer) its connection"""
+        subscriber_id = msg.get("subscriberId")
+        if subscriber_id:
+            log.info("viewer-ready from %s", subscriber_id)
+            self.create_subscriber_connection(subscriber_id)
+
     def handle_answer(self, msg: Dict[str, Any]) -> None:
         """Route answer to the correct subscriber"""
         subscriber_id = msg.get("subscriberId")
         if not subscriber_id:
-            print("[publisher] answer missing subscriberId")
+            log.warning("answer missing subscriberId")
             return
 
         sub = self._subscribers.get(subscriber_id)
         if not sub:
-            print(f"[publisher] answer for unknown subscriber {subscriber_id}")
+            log.warning("answer for unknown subscriber %s", subscriber_id)
             return
 
-        sub.handle_answer(msg)
+        task = asyncio.create_task(sub.handle_answer(msg))
+        self._answer_tasks.add(task)
+        task.add_done_callback(self._answer_tasks.discard)
 
     def handle_candidate(self, msg: Dict[str, Any]) -> None:
         """Route ICE candidate to the correct subscriber"""
         subscriber_id = msg.get("subscriberId")
         if not subscriber_id:
-            print("[publisher] candidate missing subscriberId")
+            log.warning("candidate missing subscriberId")
             return
 
         sub = self._subscribers.get(subscriber_id)
         if not sub:
-            print(f"[publisher] candidate for unknown subscriber {subscriber_id}")
+            log.warning("candidate for unknown subscriber %s", subscriber_id)
             return
 
         sub.handle_candidate(msg)
 
 
+# Binary control frames: [1-byte kind][UTF-8 argument], e.g. b"\x01UP".
+# JSON frames always start with "{", so the tags can't collide with them.
+KIND_KEY = 1
+KIND_TEXT = 2
+KIND_LAUNCH = 3
+BINARY_CONTROL_TAGS = (bytes([KIND_KEY]), bytes([KIND_TEXT]), bytes([KIND_LAUNCH]))
+
+
+async def _send_key(roku: RokuECP, key: str) -> Dict[str, Any]:
+    await roku.key(key)
+    return {"ok": True, "kind": "key", "handled": key}
+
+
+async def _send_text(roku: RokuECP, text: str) -> Dict[str, Any]:
+    await roku.text(text)
+    return {"ok": True, "kind": "text", "len": len(text)}
+
+
+async def _launch_app(roku: RokuECP, app_id: str) -> Dict[str, Any]:
+    await roku.launch(app_id)
+    return {"ok": True, "kind": "launch", "appId": app_id}
+
+
+async def handle_binary_control(roku: RokuECP, frame: bytes) -> Dict[str, Any]:
+    """Fast path for tagged binary control frames (no JSON parse, no payload dict)"""
+    kind = frame[0]
+    arg = frame[1:].decode()
+    if kind == KIND_KEY:
+        if not arg:
+            raise ValueError("control frame missing key")
+        return await _send_key(roku, arg)
+
+    if kind == KIND_TEXT:
+        return await _send_text(roku, arg)
+
+    if kind == KIND_LAUNCH:
+        if not arg:
+            raise ValueError("control frame missing appId")
+        return await _launch_app(roku, arg)
+
+    raise ValueError(f"unknown binary control kind: {kind}")
+
+
+async def _do_key(roku: RokuECP, payload: Dict[str, Any]) -> Dict[str, Any]:
+    key = payload.get("key")
+    if not isinstance(key, str) or not key:
+        raise ValueError("control payload missing 'key'")
+    return await _send_key(roku, key)
+
+
+async def _do_text(roku: RokuECP, payload: Dict[str, Any]) -> Dict[str, Any]:
+    text = payload.get("text", "")
+    if not isinstance(text, str):
+        raise ValueError("control payload 'text' must be a string")
+    return await _send_text(roku, text)
+
+
+async def _do_launch(roku: RokuECP, payload: Dict[str, Any]) -> Dict[str, Any]:
+    app_id = payload.get("appId")
+    if not isinstance(app_id, str) or not app_id:
+        raise ValueError("control payload missing 'appId'")
+    return await _launch_app(roku, app_id)
+
+
+# control "kind" -> handler
+_HANDLERS = {
+    "key": _do_key,
+    "text": _do_text,
+    "launch": _do_launch,
+}
+
+
 async def handle_control(roku: RokuECP, payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Expected payload shapes:
@@ -521,42 +1382,70 @@ async def handle_control(roku: RokuECP, payload: Dict[str, Any]) -> Dict[str, An
       { "kind": "launch", "appId": "12" }
     """
     kind = payload.get("kind")
-    if kind == "key":
-        key = payload.get("key")
-        if not isinstance(key, str) or not key:
-            raise ValueError("control payload missing 'key'")
-        await roku.key(key)
-        return {"ok": True, "kind": "key", "handled": key}
-
-    if kind == "text":
-        text = payload.get("text", "")
-        if not isinstance(text, str):
-            raise ValueError("control payload 'text' must be a string")
-        await roku.text(text)
-        return {"ok": True, "kind": "text", "len": len(text)}
-
-    if kind == "launch":
-        app_id = payload.get("appId")
-        if not isinstance(app_id, str) or not app_id:
-            raise ValueError("control payload missing 'appId'")
-        await roku.launch(app_id)
-        return {"ok": True, "kind": "launch", "appId": app_id}
-
-    raise ValueError(f"unknown control kind: {kind!r}")
+    fn = _HANDLERS.get(kind) if isinstance(kind, str) else None
+    if fn is None:
+        raise ValueError(f"unknown control kind: {kind!r}")
+    return await fn(roku, payload)
+
+
+async def control_and_ack(
+    control: Callable[[], Awaitable[Dict[str, Any]]],
+    outbox: SignalingOutbox,
+    sem: asyncio.Semaphore,
+    payload: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Run one control command off the receive loop (bounded by `sem`) and queue
+    its control-status ack. Never raises, so it can't tear down the TaskGroup.
+    """
+    async with sem:
+        try:
+            result = await control()
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+            if payload is not None:
+                result["payload"] = payload
+            log.warning("control error: %s", result)
+    outbox.post_nowait(CONTROL_STATUS_TMPL % jdump(result))
 
 
 async def publisher_loop(args: argparse.Namespace) -> None:
-    roku = RokuECP(args.roku_ip, port=args.roku_port)
+    # One keep-alive HTTP session to the Roku, shared across signaling reconnects
+    async with RokuECP(args.roku_ip, port=args.roku_port) as roku:
+        await signaling_loop(args, roku)
+
+
+async def signaling_loop(args: argparse.Namespace, roku: RokuECP) -> None:
+    backoff = RECONNECT_BACKOFF_MIN_S
 
     while True:
         gst_pub: Optional[GstWebRTCPublisher] = None
+        outbox: Optional[SignalingOutbox] = None
+        control_tasks: set[asyncio.Task[None]] = set()
         try:
-            print(f"[publisher] connecting to signaling: {args.signaling}")
-            async with websockets.connect(
-                args.signaling, ping_interval=20, ping_timeout=20
+            log.info("connecting to signaling: %s", args.signaling)
+            async with signaling_connect(
+                args.signaling,
+                # Liveness of the media path is covered by ICE/DTLS; WS pings only
+                # need to catch a dead signaling socket
+                ping_interval=60,
+                ping_timeout=30,
+                # Per-connection buffering trade-off: the receive loop drains fast,
+                # so 64 queued frames absorb an ICE burst while still bounding
+                # inbound memory; frames are capped at 1 MiB and writes apply
+                # backpressure.
+                max_queue=64,
+                max_size=2**20,
+                write_limit=SIGNALING_WRITE_LIMIT,
+                # Signaling frames are small JSON; deflate only costs CPU
+                compression=None,
             ) as ws:
-                await send_json(ws, {"type": "hello", "role": "publisher"})
-                print("[publisher] sent hello as publisher")
+                tune_signaling_socket(ws)
+                await ws.send(HELLO_PUBLISHER)
+                log.info("sent hello as publisher")
+
+                outbox = SignalingOutbox(ws, asyncio.get_running_loop())
+                outbox.start()
 
                 # Start GStreamer publisher wired to this WS
                 gst_pub = GstWebRTCPublisher(
@@ -564,95 +1453,112 @@ async def publisher_loop(args: argparse.Namespace) -> None:
                     video_size=args.video_size,
                     framerate=args.framerate,
                     audio_device=args.audio_device,
+                    force_encode=args.force_encode,
+                    encoder=EncoderSettings(args.encoder, args.preset, args.threads),
+                    raw_capture=args.raw_capture,
+                    warm_subscribers=args.warm_subscribers,
+                    run_glib_loop=not args.glib_event_loop,
                 )
-                gst_pub.start(asyncio.get_running_loop(), ws)
-
-                async for raw in ws:
-                    try:
-                        msg = json.loads(raw)
-                    except Exception:
-                        print("[publisher] ignoring non-json message")
-                        continue
-
-                    mtype = msg.get("type")
-
-                    if mtype == "hello":
-                        # ack from server
-                        continue
+                gst_pub.start(asyncio.get_running_loop(), outbox)
+
+                # Control commands run as background tasks so a slow Roku request
+                # never holds up ICE/answer handling. They are cancelled when the
+                # socket closes: their acks could no longer be delivered, and a
+                # backlog against a dead Roku must not delay the reconnect.
+                control_sem = asyncio.Semaphore(args.control_concurrency)
+                control_outbox = outbox
+                recv = ws.recv
+
+                def spawn_control(
+                    control: Callable[[], Awaitable[Dict[str, Any]]],
+                    payload: Optional[Dict[str, Any]] = None,
+                ) -> None:
+                    task = asyncio.create_task(
+                        control_and_ack(control, control_outbox, control_sem, payload)
+                    )
+                    control_tasks.add(task)
+                    task.add_done_callback(control_tasks.discard)
+
+                def on_control(msg: Dict[str, Any]) -> None:
+                    payload = msg.get("payload") or {}
+                    if not isinstance(payload, dict):
+                        payload = {}
+                    spawn_control(
+                        functools.partial(handle_control, roku, payload), payload
+                    )
 
-                    if mtype == "peer":
-                        # signaling server notifies connection events
-                        # {type:"peer", event:"connected"|"disconnected", role:"subscriber"|..., subscriberId?:string}
-                        event = msg.get("event")
-                        role = msg.get("role")
-                        subscriber_id = msg.get("subscriberId")
-
-                        if (
-                            event == "connected"
-                            and role == "subscriber"
-                            and subscriber_id
-                            and gst_pub
-                        ):
-                            # Subscriber connected - wait for viewer-ready message to create connection
-                            print(f"[publisher] subscriber {subscriber_id} connected")
-                        elif (
-                            event == "disconnected"
-                            and role == "subscriber"
-                            and subscriber_id
-                            and gst_pub
-                        ):
-                            # Subscriber disconnected - cleanup
-                            gst_pub.remove_subscriber_connection(subscriber_id)
-                        continue
+                def on_hello(msg: Dict[str, Any]) -> None:
+                    nonlocal backoff
+                    if msg.get("ok"):
+                        backoff = RECONNECT_BACKOFF_MIN_S
+
+                # message type -> handler: one dict lookup per inbound frame
+                handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+                    "hello": on_hello,
+                    "peer": gst_pub.handle_peer,
+                    "viewer-ready": gst_pub.handle_viewer_ready,
+                    "answer": gst_pub.handle_answer,
+                    "candidate": gst_pub.handle_candidate,
+                    "candidates": gst_pub.handle_candidate,
+                    "control": on_control,
+                }
 
-                    if mtype == "viewer-ready":
-                        # Subscriber is ready - create a new connection for them
-                        subscriber_id = msg.get("subscriberId")
-                        if subscriber_id and gst_pub:
-                            print(f"[publisher] viewer-ready from {subscriber_id}")
-                            gst_pub.create_subscriber_connection(subscriber_id)
+                while True:
+                    try:
+                        # decode=False hands TEXT frames over as raw bytes, which skips
+                        # websockets' UTF-8 decode; jload parses bytes directly.
+                        raw = await recv(decode=False)
+                    except websockets.ConnectionClosedOK:
+                        break
+                    except websockets.ConnectionClosedError as e:
+                        log.warning("signaling connection error: %s", e)
+                        break
+
+                    # --- Binary control fast path ---
+                    if isinstance(raw, bytes) and raw[:1] in BINARY_CONTROL_TAGS:
+                        spawn_control(
+                            functools.partial(handle_binary_control, roku, raw)
+                        )
                         continue
 
-                    # --- WebRTC signaling (answer / candidate) ---
-                    if mtype == "answer" and gst_pub:
-                        gst_pub.handle_answer(msg)
+                    try:
+                        msg = jload(raw)
+                    except Exception:
+                        log.debug("ignoring non-json message")
                         continue
 
-                    if mtype == "candidate" and gst_pub:
-                        gst_pub.handle_candidate(msg)
+                    if not isinstance(msg, dict):
+                        log.debug("ignoring non-object message")
                         continue
 
-                    # --- Control ---
-                    if mtype == "control":
-                        payload = msg.get("payload") or {}
-                        if not isinstance(payload, dict):
-                            payload = {}
+                    # Unknown types (info/error, ...) are ignored
+                    mtype = msg.get("type")
+                    handler = handlers.get(mtype) if isinstance(mtype, str) else None
+                    if handler:
+                        # One malformed frame from a viewer must not take the
+                        # publisher down with it
                         try:
-                            result = await handle_control(roku, payload)
-                            await send_json(
-                                ws, {"type": "control-status", "payload": result}
-                            )
-                            # Optional: print for debugging
-                            # print(f"[publisher] control ok: {result}")
-                        except Exception as e:
-                            err = {"ok": False, "error": str(e), "payload": payload}
-                            await send_json(
-                                ws, {"type": "control-status", "payload": err}
-                            )
-                            print(f"[publisher] control error: {err}")
-                        continue
-
-                    # ignore everything else (offer from other side, info/error, etc.)
+                            handler(msg)
+                        except Exception:
+                            log.exception("error handling %s message", mtype)
         except (OSError, websockets.WebSocketException) as e:
-            print(f"[publisher] signaling connection error: {e}")
+            log.warning("signaling connection error: %s", e)
         finally:
+            for task in control_tasks:
+                task.cancel()
             if gst_pub:
                 try:
                     gst_pub.stop()
                 except Exception:
                     pass
+            if outbox:
+                outbox.stop()
 
-        await asyncio.sleep(1.0)
+        # Jittered so a fleet of publishers doesn't reconnect in lockstep
+        delay = backoff * (0.5 + random.random())
+        log.info("reconnecting in %.1fs", delay)
+        await asyncio.sleep(delay)
+        backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX_S)
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -672,16 +1578,147 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     p.add_argument(
         "--audio-device", default=None, help='ALSA device like "hw:2,0" (optional)'
     )
+    p.add_argument(
+        "--force-encode",
+        action="store_true",
+        help="Always decode + re-encode, even if the device can output H.264",
+    )
+    p.add_argument(
+        "--encoder",
+        choices=H264_ENCODERS,
+        default="auto",
+        help="H.264 encoder: vaapi (Intel/AMD), v4l2 (RPi/Jetson), nvenc (NVIDIA) "
+        "or software x264; auto tries vaapi, then v4l2, else x264",
+    )
+    p.add_argument(
+        "--preset",
+        choices=X264_PRESETS,
+        default="ultrafast",
+        help="x264 speed preset (software encoder only)",
+    )
+    p.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="x264 encoder threads / slices per frame (software encoder only)",
+    )
+    p.add_argument(
+        "--raw-capture",
+        action="store_true",
+        help="Capture uncompressed NV12/I420/YUY2 instead of MJPEG (skips JPEG "
+        "decode; needs USB bandwidth for the chosen size/framerate)",
+    )
+    p.add_argument(
+        "--warm-subscribers",
+        type=int,
+        default=0,
+        help="Keep this many webrtcbins pre-built and linked so a new viewer "
+        "only waits for its offer (default 0: build on demand)",
+    )
+    p.add_argument(
+        "--control-concurrency",
+        type=int,
+        default=1,
+        help="Max control commands sent to the Roku at once (default 1 keeps "
+        "key presses in order)",
+    )
+    p.add_argument(
+        "--glib-event-loop",
+        action="store_true",
+        help="Drive GLib from the asyncio loop (needs gbulb or asyncio-glib) "
+        "instead of a separate GLib thread; replaces uvloop",
+    )
+    p.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        help="Logging level (default INFO)",
+    )
+    p.add_argument(
+        "--no-uvloop",
+        action="store_true",
+        help="Use the stock asyncio loop. uvloop is optional and only used when "
+        "installed",
+    )
 
     return p.parse_args(argv)
 
 
+def uvloop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """uvloop's loop constructor when it is installed (not on Windows), else None"""
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def install_glib_event_loop() -> None:
+    """
+    Make the asyncio loop iterate GLib's default main context, so GLib idle
+    callbacks and bus watches run on the asyncio thread without a GLib thread.
+
+    Prefers gbulb, whose loop is a GLib main loop with asyncio on top, over
+    asyncio-glib's selector that polls the GLib context between iterations.
+    """
+    try:
+        import gbulb
+    except ImportError:
+        import asyncio_glib
+
+        asyncio.set_event_loop_policy(asyncio_glib.GLibEventLoopPolicy())
+        return
+    gbulb.install()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched. The stock prepare() runs
+    the formatter (msg % args, traceback text) on the emitting thread so the
+    record can be pickled; this queue never leaves the process, so that work
+    is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: str) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue: the emitting thread (GStreamer streaming,
+    GLib or asyncio) only enqueues the record, and the listener's own thread
+    formats it and writes to stderr. The caller stops the returned listener.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, handler)
+    logging.basicConfig(level=level, handlers=[_DeferredQueueHandler(records)])
+    listener.start()
+    return listener
+
+
 def main() -> None:
     args = parse_args()
+    listener = setup_logging(args.log_level)
+    loop_factory = None
+    if args.glib_event_loop:
+        install_glib_event_loop()
+    elif not args.no_uvloop:
+        loop_factory = uvloop_factory()
     try:
-        asyncio.run(publisher_loop(args))
+        # loop_factory=None falls back to the policy's (default or GLib) loop
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(publisher_loop(args))
     except KeyboardInterrupt:
-        print("\n[publisher] stopped")
+        log.info("stopped")
+    finally:
+        # Flushes whatever is still queued
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -7,18 +7,27 @@
 #
 # Usage:
 #   from publisher.roku import RokuECP
-#   roku = RokuECP("192.168.1.50")
-#   await roku.key("HOME")
-#   await roku.text("netflix")
-#   await roku.launch("12")  # example app id
+#   async with RokuECP("192.168.1.50") as roku:
+#       await roku.key("HOME")
+#       await roku.text("netflix")
+#       await roku.launch("12")  # example app id
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import ipaddress
+import random
+import socket
+import time
 import urllib.parse
-from dataclasses import dataclass
+import warnings
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
 
 import aiohttp
+import yarl
 
 
 # Generic -> Roku ECP mapping
@@ -36,8 +45,66 @@ GENERIC_TO_ROKU_KEY = {
     "PLAY_PAUSE": "Play",
 }
 
+# aiohttp default headers left off every ECP request
+_SKIP_AUTO_HEADERS = ("User-Agent",)
 
-@dataclass
+# Per-instance cap on cached request URLs (generic keys + typed characters)
+_URL_CACHE_MAX = 1024
+
+# Request paths for the generic keys, built once
+_KEYPRESS_PATH = {k: f"/keypress/{v}" for k, v in GENERIC_TO_ROKU_KEY.items()}
+
+# Printable ASCII -> percent-encoded Lit_ argument; anything else goes via quote()
+_LIT_TABLE = {chr(c): urllib.parse.quote(chr(c), safe="") for c in range(0x20, 0x7F)}
+
+
+def _address_family(host: str) -> socket.AddressFamily:
+    """AF_INET/AF_INET6 for an IP literal; AF_UNSPEC for a hostname"""
+    try:
+        addr = ipaddress.ip_address(host)
+    except ValueError:
+        return socket.AF_UNSPEC
+    return socket.AF_INET6 if addr.version == 6 else socket.AF_INET
+
+
+# One pipelined keypress request: (path, host)
+_PIPELINE_REQUEST_TMPL = b"POST %b HTTP/1.1\r\nHost: %b\r\nContent-Length: 0\r\n\r\n"
+
+
+async def _read_http_response(
+    reader: asyncio.StreamReader,
+) -> tuple[int | None, bytes]:
+    """
+    Read one Content-Length framed HTTP/1.1 response. Returns (None, b"") if
+    the server closed the connection before sending a status line.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        return None, b""
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+        raise RuntimeError(f"Roku ECP sent a bad status line: {status_line[:80]!r}")
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    body = await reader.readexactly(length) if length else b""
+    return int(parts[1]), body
+
+
+@functools.lru_cache(maxsize=64)
+def _raw_keypress_path(roku_key: str) -> str:
+    # Request URLs are built with encoded=True, so quote the name here
+    return f"/keypress/{urllib.parse.quote(roku_key, safe='')}"
+
+
+def _lit_path(ch: str) -> str:
+    encoded = _LIT_TABLE.get(ch) or urllib.parse.quote(ch, safe="")
+    return f"/keypress/Lit_{encoded}"
+
+
+@dataclass(slots=True)
 class RokuECP:
     """
     Roku External Control Protocol (ECP) client over HTTP.
@@ -46,6 +113,10 @@ class RokuECP:
       - Most Roku devices listen on port 8060.
       - Endpoints accept POST with an empty body.
       - Key presses are stateless; no key-down/up needed.
+      - Requests share one keep-alive session, opened on first use; call
+        aclose() (or use `async with`) when done.
+      - Per-keypress cost is mostly event-loop overhead on a LAN; embedders
+        should run it on uvloop where available (the CLI below does).
     """
 
     ip: str
@@ -53,11 +124,168 @@ class RokuECP:
     timeout_s: float = 3.0
     retries: int = 2
     retry_backoff_s: float = 0.15
+    # Retry sleeps are scaled by a random factor in [1 - jitter, 1 + jitter] so
+    # concurrent senders don't retry in lockstep, and capped at retry_max_delay_s
+    retry_jitter: float = 0.5
+    retry_max_delay_s: float = 5.0
+    # Circuit breaker: after breaker_threshold requests in a row exhaust their
+    # retries, fail fast for breaker_cooldown_s, then let a single request probe
+    # while the others keep failing fast until it has an answer
+    breaker_threshold: int = 5
+    breaker_cooldown_s: float = 10.0
+    # Called with (path, error) instead of raising when the device is unreachable
+    # (retries exhausted or circuit open); the request then counts as handled.
+    # Runs once per failed request, so keep it fast and idempotent (log, drop).
+    on_failure: Callable[[str, BaseException], Awaitable[None]] | None = None
+    # Max keypresses in flight when text() runs with ordered=False
+    concurrency: int = 4
+    # text() pacing: at most rate_hz characters/s, shared by every text() call
+    # (0 disables)
+    rate_hz: float = 50.0
+    # Opt-in: requests made without an explicit session go through one worker
+    # task that collects them for max_batch_window_s and sends up to max_batch
+    # back-to-back on the shared session, in arrival order
+    batching: bool = False
+    max_batch: int = 16
+    max_batch_window_s: float = 0.005
+
+    _session: aiohttp.ClientSession | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _breaker_fail_count: int = field(default=0, init=False, repr=False, compare=False)
+    _breaker_opened_at: float | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _breaker_probing: bool = field(default=False, init=False, repr=False, compare=False)
+    _queue: asyncio.Queue[tuple[str, asyncio.Future[None]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _worker_task: asyncio.Task[None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _base: yarl.URL = field(init=False, repr=False, compare=False)
+    _timeout: aiohttp.ClientTimeout = field(init=False, repr=False, compare=False)
+    _tokens: float = field(default=1.0, init=False, repr=False, compare=False)
+    _tokens_ts: float = field(default=0.0, init=False, repr=False, compare=False)
+    _urls: dict[str, yarl.URL] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._base = yarl.URL.build(scheme="http", host=self.ip, port=self.port)
+        # A LAN TCP connect that takes over a second has failed; fail it fast and
+        # leave the rest of the budget for the response. sock_connect, not
+        # connect: the latter also counts time queued for a free pool slot.
+        self._timeout = aiohttp.ClientTimeout(
+            total=self.timeout_s,
+            sock_connect=min(self.timeout_s, 1.0),
+            sock_read=self.timeout_s,
+        )
 
     @property
     def base_url(self) -> str:
         return f"http://{self.ip}:{self.port}"
 
+    def _url(self, path: str) -> yarl.URL:
+        """
+        Request URL for an already percent-encoded path. Built with encoded=True
+        (no re-quoting) and cached, so aiohttp gets a ready URL object instead of
+        parsing a string on every keypress.
+        """
+        url = self._urls.get(path)
+        if url is None:
+            url = self._base.with_path(path, encoded=True)
+            if len(self._urls) < _URL_CACHE_MAX:
+                self._urls[path] = url
+        return url
+
+    async def __aenter__(self) -> "RokuECP":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """The cached session, (re)created if it was never opened or got closed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self._timeout,
+                # One device: the pool only needs as many keep-alive connections
+                # as keypresses we put in flight, and an IP literal pins the
+                # socket family (no IPv6 attempts for an IPv4 Roku)
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=self.concurrency,
+                    family=_address_family(self.ip),
+                    enable_cleanup_closed=True,
+                ),
+                # ECP sets no cookies; don't parse or store Set-Cookie at all
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """
+        Stop the batching worker (cancelling queued requests) and close the
+        cached session; the next request opens a new one.
+        """
+        task, self._worker_task = self._worker_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def _send(self, path: str, session: aiohttp.ClientSession | None) -> None:
+        """POST directly, or via the batching worker when enabled"""
+        if session is not None or not self.batching:
+            await self._post(path, session=session)
+            return
+
+        queue = self._queue
+        if queue is None:
+            queue = self._queue = asyncio.Queue()
+        # (Re)start the worker if it was never started or has died
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._worker(queue))
+        fut = asyncio.get_running_loop().create_future()
+        queue.put_nowait((path, fut))
+        await fut
+
+    async def _worker(
+        self, queue: asyncio.Queue[tuple[str, asyncio.Future[None]]]
+    ) -> None:
+        batch: list[tuple[str, asyncio.Future[None]]] = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                if self.max_batch_window_s > 0:
+                    await asyncio.sleep(self.max_batch_window_s)
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                session = await self._get_session()
+                # Sequential on purpose: keypresses must reach the device in order
+                for path, fut in batch:
+                    if fut.done():  # caller gave up
+                        continue
+                    try:
+                        await self._post(path, session=session)
+                    except Exception as e:
+                        if not fut.done():
+                            fut.set_exception(e)
+                    else:
+                        if not fut.done():
+                            fut.set_result(None)
+                batch.clear()
+        finally:
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _path, fut in batch:
+                fut.cancel()
+
     async def key(
         self, generic_key: str, session: aiohttp.ClientSession | None = None
     ) -> None:
@@ -68,14 +296,17 @@ class RokuECP:
         if not generic_key:
             raise ValueError("generic_key is required")
 
-        generic_key = generic_key.upper()
-        roku_key = GENERIC_TO_ROKU_KEY.get(generic_key)
-        if not roku_key:
+        # Clients normally send upper-case names already; only upper() otherwise
+        path = _KEYPRESS_PATH.get(generic_key)
+        if path is None:
+            generic_key = generic_key.upper()
+            path = _KEYPRESS_PATH.get(generic_key)
+        if path is None:
             raise ValueError(
                 f"Unsupported key '{generic_key}'. Supported: {sorted(GENERIC_TO_ROKU_KEY.keys())}"
             )
 
-        await self._post(f"/keypress/{roku_key}", session=session)
+        await self._send(path, session)
 
     async def roku_keypress(
         self, roku_key: str, session: aiohttp.ClientSession | None = None
@@ -86,13 +317,15 @@ class RokuECP:
         """
         if not roku_key:
             raise ValueError("roku_key is required")
-        await self._post(f"/keypress/{roku_key}", session=session)
+        await self._send(_raw_keypress_path(roku_key), session)
 
     async def text(
         self,
         text: str,
         session: aiohttp.ClientSession | None = None,
-        per_char_delay_s: float = 0.02,
+        per_char_delay_s: float | None = None,
+        ordered: bool = True,
+        pipeline: bool = False,
     ) -> None:
         """
         Type text by sending Lit_<char> keypresses.
@@ -100,25 +333,139 @@ class RokuECP:
         Roku expects each character via:
           POST /keypress/Lit_<url-encoded-char>
 
-        per_char_delay_s helps prevent overruns on some networks/devices.
+        Characters are paced by the instance's rate_hz token bucket (shared by
+        concurrent text() calls) to prevent overruns on some networks/devices.
+        per_char_delay_s is deprecated: it sets rate_hz to 1 / per_char_delay_s
+        for this and later calls (0 disables pacing).
+
+        ordered=True (default) waits for each keypress before sending the next.
+        ordered=False keeps up to `concurrency` keypresses in flight; faster, but
+        a device may then receive characters out of order, so only use it where
+        that is known not to happen.
+
+        pipeline=True writes every keypress at once on a dedicated connection
+        (HTTP/1.1 pipelining) and then reads the responses in order: one round
+        trip for the whole string, but no pacing, so only for devices that keep
+        up with it. If the connection fails part-way the rest is not re-sent
+        (see _pipeline_text).
         """
         if text is None:
             raise ValueError("text cannot be None")
 
-        owns_session = session is None
-        if owns_session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout_s)
-            session = aiohttp.ClientSession(timeout=timeout)
+        if per_char_delay_s is not None:
+            warnings.warn(
+                "per_char_delay_s is deprecated; set RokuECP.rate_hz instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            self.rate_hz = 1 / per_char_delay_s if per_char_delay_s > 0 else 0.0
 
-        try:
+        if pipeline and text:
+            await self._pipeline_text(text)
+            return
+
+        if session is None and not self.batching:
+            session = await self._get_session()
+
+        if ordered:
             for ch in text:
-                encoded = urllib.parse.quote(ch, safe="")
-                await self._post(f"/keypress/Lit_{encoded}", session=session)
-                if per_char_delay_s > 0:
-                    await asyncio.sleep(per_char_delay_s)
+                await self._take_token()
+                await self._send(_lit_path(ch), session)
+            return
+
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def press(ch: str) -> None:
+            # Tokens are reserved in start order, which keeps the dispatch order
+            await self._take_token()
+            async with sem:
+                await self._send(_lit_path(ch), session)
+
+        await asyncio.gather(*(press(ch) for ch in text))
+
+    async def _pipeline_text(self, text: str) -> None:
+        """
+        Type `text` with pipelined requests. While the circuit breaker is open
+        the batch fails fast like any other request; half-open, it goes through
+        regular requests so that a single keypress probes the device. If the
+        connection can't be opened nothing was sent, so it also falls back to
+        regular requests.
+
+        Once the batch is written nothing is re-sent: unanswered pipelined POSTs
+        may already have been processed (RFC 9112 section 9.3.2), and retrying
+        them could type characters twice. A reset, early close or timeout is
+        reported as unreachable (breaker + on_failure). Non-2xx responses don't
+        stop the read, since the requests behind them were already sent; the
+        first one is raised as RuntimeError once every response is in.
+        """
+        if self._breaker_rejects():
+            err = RuntimeError(f"Roku ECP at {self.ip} unreachable (circuit open)")
+            await self._unreachable(_lit_path(text[0]), err)
+            return
+        if self._breaker_opened_at is not None:
+            await self.text(text)
+            return
+
+        host = self._base.raw_authority.encode()
+        payload = b"".join(
+            _PIPELINE_REQUEST_TMPL % (_lit_path(ch).encode(), host) for ch in text
+        )
+
+        try:
+            async with asyncio.timeout(self.timeout_s):
+                reader, writer = await asyncio.open_connection(self.ip, self.port)
+        except (OSError, TimeoutError):
+            # Nothing sent yet; the regular path retries and feeds the breaker
+            await self.text(text)
+            return
+
+        answered = 0
+        rejected: RuntimeError | None = None
+        try:
+            writer.write(payload)
+            async with asyncio.timeout(self.timeout_s):
+                for answered in range(len(text)):
+                    status, body = await _read_http_response(reader)
+                    if status is None:
+                        raise ConnectionResetError("connection closed by the device")
+                    # Any response means the device is reachable
+                    self._breaker_success()
+                    if rejected is None and (status < 200 or status >= 300):
+                        rejected = RuntimeError(
+                            f"Roku ECP POST {_lit_path(text[answered])} failed: "
+                            f"{status} {body[:200]!r}"
+                        )
+            if rejected is not None:
+                raise rejected
+        except (OSError, asyncio.IncompleteReadError, TimeoutError) as e:
+            self._breaker_failure()
+            err = ConnectionError(
+                f"Roku ECP pipelined text: no response for {len(text) - answered} "
+                f"of {len(text)} keypresses, which may or may not have been typed "
+                f"({e!r})"
+            )
+            err.__cause__ = e
+            await self._unreachable(_lit_path(text[answered]), err)
         finally:
-            if owns_session and session:
-                await session.close()
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    async def _take_token(self) -> None:
+        """
+        Wait for one token from the typing rate limiter. Each caller reserves its
+        token up front (the balance may go negative) and sleeps off the deficit,
+        so concurrent callers are spaced 1/rate_hz apart instead of waking
+        together. The bucket holds one token: no bursts after a pause.
+        """
+        if self.rate_hz <= 0:
+            return
+        now = time.monotonic()
+        elapsed = now - self._tokens_ts
+        self._tokens = min(1.0, self._tokens + elapsed * self.rate_hz) - 1
+        self._tokens_ts = now
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate_hz)
 
     async def launch(
         self, app_id: str, session: aiohttp.ClientSession | None = None
@@ -130,7 +477,7 @@ class RokuECP:
         if not app_id:
             raise ValueError("app_id is required")
         app_id_enc = urllib.parse.quote(str(app_id), safe="")
-        await self._post(f"/launch/{app_id_enc}", session=session)
+        await self._send(f"/launch/{app_id_enc}", session)
 
     async def _post(
         self, path: str, session: aiohttp.ClientSession | None = None
@@ -140,35 +487,92 @@ class RokuECP:
 
         Retries on network-ish errors (timeouts, connection reset, etc).
         Does NOT retry on non-2xx HTTP responses.
+        Raises RuntimeError immediately while the circuit breaker is open.
+        Unreachable-device errors go to on_failure instead, when it is set.
         """
-        url = self.base_url + path
+        if self._breaker_rejects():
+            err = RuntimeError(f"Roku ECP at {self.ip} unreachable (circuit open)")
+            await self._unreachable(path, err)
+            return
+        if self._breaker_opened_at is not None:
+            # Half-open: this request is the one probe. A response closes the
+            # breaker, a failure re-opens it for another cooldown.
+            self._breaker_probing = True
+            try:
+                await self._post_with_retries(path, session)
+            finally:
+                self._breaker_probing = False
+            return
 
-        owns_session = session is None
-        if owns_session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout_s)
-            session = aiohttp.ClientSession(timeout=timeout)
+        await self._post_with_retries(path, session)
 
-        try:
-            for attempt in range(self.retries + 1):
+    async def _post_with_retries(
+        self, path: str, session: aiohttp.ClientSession | None
+    ) -> None:
+        """_post() past the breaker check: the request and its retries"""
+        url = self._url(path)
+
+        if session is None:
+            session = await self._get_session()
+
+        for attempt in range(self.retries + 1):
+            try:
+                # No User-Agent: ECP ignores it, and it's sent with every keypress
+                resp = await session.post(
+                    url, data=b"", skip_auto_headers=_SKIP_AUTO_HEADERS
+                )
                 try:
-                    async with session.post(url, data=b"") as resp:
-                        if resp.status < 200 or resp.status >= 300:
-                            body = await resp.text()
-                            raise RuntimeError(
-                                f"Roku ECP POST {path} failed: {resp.status} {body[:200]}"
-                            )
-                        return
-                except RuntimeError:
-                    # Don't retry non-2xx responses
-                    raise
-                except (aiohttp.ClientError, asyncio.TimeoutError):
-                    if attempt < self.retries:
-                        await asyncio.sleep(self.retry_backoff_s * (2**attempt))
-                    else:
-                        raise
-        finally:
-            if owns_session and session:
-                await session.close()
+                    # Any response means the device is reachable
+                    self._breaker_success()
+                    if resp.status < 200 or resp.status >= 300:
+                        body = await resp.text()
+                        raise RuntimeError(
+                            f"Roku ECP POST {path} failed: {resp.status} {body[:200]}"
+                        )
+                finally:
+                    # The 2xx body is empty and never read; hand the connection
+                    # straight back to the pool
+                    resp.release()
+                return
+            except RuntimeError:
+                # Don't retry non-2xx responses
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt < self.retries:
+                    delay = min(
+                        self.retry_backoff_s * (2**attempt), self.retry_max_delay_s
+                    )
+                    jitter = random.uniform(-self.retry_jitter, self.retry_jitter)
+                    await asyncio.sleep(delay * (1 + jitter))
+                else:
+                    self._breaker_failure()
+                    await self._unreachable(path, e)
+                    return
+
+    def _breaker_rejects(self) -> bool:
+        """True while the breaker is open, or half-open with its probe in flight"""
+        opened_at = self._breaker_opened_at
+        return opened_at is not None and (
+            self._breaker_probing
+            or time.monotonic() - opened_at < self.breaker_cooldown_s
+        )
+
+    def _breaker_success(self) -> None:
+        """The device answered: reset the failure count and close the breaker"""
+        self._breaker_fail_count = 0
+        self._breaker_opened_at = None
+
+    def _breaker_failure(self) -> None:
+        """Count a request that never got a response; open the breaker if due"""
+        self._breaker_fail_count += 1
+        if self._breaker_fail_count >= self.breaker_threshold:
+            self._breaker_opened_at = time.monotonic()
+
+    async def _unreachable(self, path: str, err: BaseException) -> None:
+        """Hand a failed request to on_failure, or raise `err` if there is none"""
+        if self.on_failure is None:
+            raise err
+        await self.on_failure(path, err)
 
 
 # Optional: simple CLI smoke test
@@ -177,6 +581,7 @@ class RokuECP:
 #   python -m publisher.roku --ip 192.168.1.50 --launch 12
 if __name__ == "__main__":
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser(description="Minimal Roku ECP client")
     parser.add_argument("--ip", required=True, help="Roku IP address (LAN)")
@@ -192,18 +597,28 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     async def _main():
-        roku = RokuECP(args.ip, port=args.port)
-        if args.key:
-            await roku.key(args.key)
-            print(f"Sent key: {args.key}")
-        if args.text is not None:
-            await roku.text(args.text)
-            print(f"Typed text: {args.text!r}")
-        if args.launch:
-            await roku.launch(args.launch)
-            print(f"Launched app: {args.launch}")
+        async with RokuECP(args.ip, port=args.port) as roku:
+            if args.key:
+                await roku.key(args.key)
+                print(f"Sent key: {args.key}")
+            if args.text is not None:
+                await roku.text(args.text)
+                print(f"Typed text: {args.text!r}")
+            if args.launch:
+                await roku.launch(args.launch)
+                print(f"Launched app: {args.launch}")
 
         if not args.key and args.text is None and not args.launch:
             print("Nothing to do. Provide --key and/or --text and/or --launch.")
 
-    asyncio.run(_main())
+    # uvloop when installed (not on Windows), like publisher.main
+    loop_factory = None
+    if sys.platform != "win32":
+        try:
+            import uvloop
+
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            pass
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(_main())
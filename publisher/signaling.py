@@ -0,0 +1,246 @@
+# publisher/signaling.py
+#
+# Signaling websocket client.
+# - picows (Cython, callback based) when installed:
+#     pip install -r publisher/requirements-picows.txt
+# - websockets otherwise
+#
+# Both are exposed through the websockets surface publisher_loop already uses:
+# send(), recv(decode=False), .transport and websockets' exception types.
+#
+# Usage:
+#   from publisher.signaling import connect
+#   async with connect("ws://host:8080", ping_interval=20) as ws:
+#       await ws.send(b'{"type":"hello"}')
+#       raw = await ws.recv(decode=False)
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple, Union
+
+import websockets
+from websockets.frames import Close, CloseCode
+
+if TYPE_CHECKING:
+    import picows
+else:
+    try:
+        import picows
+    except ImportError:  # pragma: no cover - optional dependency
+        picows = None
+
+
+# Close codes that end the connection without raising ConnectionClosedError
+_CLEAN_CLOSE = (
+    CloseCode.NORMAL_CLOSURE,
+    CloseCode.GOING_AWAY,
+    CloseCode.NO_STATUS_RCVD,
+)
+
+# Close codes reserved for local use that must never be sent in a close frame
+# (RFC 6455 section 7.4.1); a CLOSE carrying none of them is answered with 1000
+_RESERVED_CLOSE = (
+    CloseCode.NO_STATUS_RCVD,
+    CloseCode.ABNORMAL_CLOSURE,
+    CloseCode.TLS_HANDSHAKE,
+)
+
+# websockets.connect() default: pause reading once 16 messages are queued
+_DEFAULT_MAX_QUEUE = 16
+
+
+if picows is not None:
+
+    class _Listener(picows.WSListener):
+        """
+        Reassembles frames into messages and queues them for PicowsConnection.
+        Runs on the event loop thread, so it only touches the loop-bound queue.
+        """
+
+        def __init__(self, conn: "PicowsConnection"):
+            self._conn = conn
+            self._fragments: List[bytes] = []
+            self._fragment_type = picows.WSMsgType.BINARY
+
+        def on_ws_frame(self, transport: picows.WSTransport, frame: picows.WSFrame):
+            msg_type = frame.msg_type
+            if msg_type == picows.WSMsgType.CLOSE:
+                code = frame.get_close_code()
+                rcvd_code = CloseCode.NO_STATUS_RCVD if code is None else int(code)
+                reason = (frame.get_close_message() or b"").decode("utf-8", "replace")
+                self._conn._rcvd = Close(rcvd_code, reason)
+                # Echo the peer's code, except the reserved 1005 that stands in
+                # for "no status" and is not allowed on the wire
+                if rcvd_code in _RESERVED_CLOSE:
+                    transport.send_close(picows.WSCloseCode.OK)
+                else:
+                    transport.send_close(code)
+                transport.disconnect()
+                return
+
+            if msg_type == picows.WSMsgType.CONTINUATION:
+                self._fragments.append(frame.get_payload_as_bytes())
+                if frame.fin:
+                    payload = b"".join(self._fragments)
+                    self._fragments.clear()
+                    self._conn._deliver(self._fragment_type, payload)
+                return
+
+            if msg_type not in (picows.WSMsgType.TEXT, picows.WSMsgType.BINARY):
+                return
+            if not frame.fin:
+                self._fragment_type = msg_type
+                self._fragments = [frame.get_payload_as_bytes()]
+                return
+            self._conn._deliver(msg_type, frame.get_payload_as_bytes())
+
+        def on_ws_disconnected(self, transport: picows.WSTransport):
+            self._conn._disconnected = True
+            self._conn._writable.set()
+            self._conn._deliver(None, b"")
+
+        def pause_writing(self):
+            self._conn._writable.clear()
+
+        def resume_writing(self):
+            self._conn._writable.set()
+
+
+class PicowsConnection:
+    """
+    picows connection adapted to the subset of websockets' ClientConnection
+    used by the publisher. Inbound messages are queued for recv(); like
+    websockets, reading from the socket pauses once max_queue messages are
+    waiting and resumes when the queue drains to its low-water mark.
+    """
+
+    def __init__(
+        self, max_queue: Union[int, Tuple[int, Optional[int]], None] = None
+    ) -> None:
+        self._queue: asyncio.Queue[
+            Tuple[Optional[picows.WSMsgType], bytes]
+        ] = asyncio.Queue()
+        # Same convention as websockets: an int is the high-water mark, the low
+        # one defaults to a quarter of it; None means unbounded
+        if isinstance(max_queue, tuple):
+            high, low = max_queue
+        else:
+            high, low = max_queue, None
+        self._queue_high = high
+        self._queue_low = low if low is not None else (high or 0) // 4
+        self._reading_paused = False
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._rcvd: Optional[Close] = None
+        self._disconnected = False
+        self._closed = False
+        self.ws_transport: Optional[picows.WSTransport] = None
+        self.transport: Optional[asyncio.Transport] = None
+
+    def _deliver(self, msg_type: Optional[picows.WSMsgType], payload: bytes) -> None:
+        # Never dropped: the close sentinel must always get through, and frames
+        # already parsed from the current read can't be pushed back
+        self._queue.put_nowait((msg_type, payload))
+        high = self._queue_high
+        if (
+            high is not None
+            and not self._reading_paused
+            and self.transport is not None
+            and self._queue.qsize() >= high
+        ):
+            self._reading_paused = True
+            self.transport.pause_reading()
+
+    def _connection_closed(self) -> websockets.ConnectionClosed:
+        rcvd = self._rcvd
+        if rcvd is not None and rcvd.code in _CLEAN_CLOSE:
+            return websockets.ConnectionClosedOK(rcvd, None)
+        return websockets.ConnectionClosedError(rcvd, None)
+
+    async def recv(self, decode: Optional[bool] = None) -> Union[str, bytes]:
+        if self._closed:
+            raise self._connection_closed()
+        msg_type, payload = await self._queue.get()
+        if (
+            self._reading_paused
+            and self.transport is not None
+            and self._queue.qsize() <= self._queue_low
+        ):
+            self._reading_paused = False
+            self.transport.resume_reading()
+        if msg_type is None:
+            self._closed = True
+            raise self._connection_closed()
+        if decode or (decode is None and msg_type == picows.WSMsgType.TEXT):
+            return payload.decode("utf-8")
+        return payload
+
+    async def send(self, message: Union[str, bytes]) -> None:
+        ws_transport = self.ws_transport
+        if ws_transport is None or self._disconnected:
+            raise self._connection_closed()
+        # Same framing as websockets: str goes out as TEXT, bytes as BINARY
+        if isinstance(message, str):
+            ws_transport.send(picows.WSMsgType.TEXT, message.encode("utf-8"))
+        else:
+            ws_transport.send(picows.WSMsgType.BINARY, message)
+        # Honour write_limit the way websockets does: wait for the buffer to drain
+        await self._writable.wait()
+
+    async def close(self) -> None:
+        ws_transport = self.ws_transport
+        if ws_transport is None:
+            return
+        if not self._disconnected:
+            ws_transport.send_close(picows.WSCloseCode.OK)
+            ws_transport.disconnect()
+        await ws_transport.wait_disconnected()
+
+
+@contextlib.asynccontextmanager
+async def _picows_connect(
+    url: str,
+    ping_interval: Optional[float] = 20,
+    ping_timeout: Optional[float] = 20,
+    max_size: Optional[int] = 2**20,
+    max_queue: Union[int, Tuple[int, Optional[int]], None] = _DEFAULT_MAX_QUEUE,
+    write_limit: Union[int, Tuple[int, int]] = 2**15,
+    **_ignored,
+) -> AsyncIterator[PicowsConnection]:
+    conn = PicowsConnection(max_queue)
+    try:
+        ws_transport, _listener = await picows.ws_connect(
+            lambda: _Listener(conn),
+            url,
+            enable_auto_ping=bool(ping_interval),
+            auto_ping_idle_timeout=ping_interval or 20,
+            auto_ping_reply_timeout=ping_timeout or 20,
+            max_frame_size=max_size or 2**31,
+        )
+    except picows.WSError as e:
+        raise websockets.InvalidHandshake(str(e)) from e
+
+    transport = ws_transport.underlying_transport
+    conn.ws_transport = ws_transport
+    conn.transport = transport
+    # Same convention as websockets: an int is the high mark, low defaults to 1/4
+    high, low = write_limit if isinstance(write_limit, tuple) else (write_limit, None)
+    transport.set_write_buffer_limits(high=high, low=low)
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+def connect(url: str, **kwargs):
+    """
+    Open the signaling connection, preferring picows. Takes websockets.connect()
+    keyword arguments; picows honours ping_interval, ping_timeout, max_size,
+    max_queue and write_limit. picows has no permessage-deflate, so a request
+    for compression (websockets' default) goes through websockets instead.
+    """
+    if picows is not None and kwargs.get("compression", "deflate") is None:
+        return _picows_connect(url, **kwargs)
+    return websockets.connect(url, **kwargs)
@@ -75,7 +75,19 @@ wss.on('connection', (ws: WebSocket, _req: IncomingMessage) => {
     message: "connected; send {type:'hello', role:'publisher'|'subscriber'}",
   });
 
-  ws.on('message', (data) => {
+  ws.on('message', (data, isBinary) => {
+    // 0) Binary control frames (subscriber -> publisher): [1-byte kind][utf-8 arg].
+    //    Relayed untouched so the publisher can skip JSON parsing for key presses.
+    //    (The publisher itself sends JSON as binary frames; those fall through.)
+    if (isBinary && role === 'subscriber') {
+      if (!publisher || publisher.readyState !== WebSocket.OPEN) {
+        safeSend(ws, { type: 'error', error: 'no publisher connected' });
+        return;
+      }
+      publisher.send(data, { binary: true });
+      return;
+    }
+
     const msg = parseJson(data);
     if (!msg) {
       safeSend(ws, { type: 'error', error: 'invalid json' });
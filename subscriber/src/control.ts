@@ -36,6 +36,23 @@ export function sendControlWS(
   socket.send(JSON.stringify(msg));
 }
 
+// Binary control frame tags (must match KIND_* in publisher/main.py)
+const KIND_KEY = 1;
+const encoder = new TextEncoder();
+
+// Key presses go out as a compact binary frame: [KIND_KEY][utf-8 key name]
+export function sendKeyWS(socket: WebSocket, key: string): void {
+  if (socket.readyState !== WebSocket.OPEN) {
+    log('ws not open (cannot send control)');
+    return;
+  }
+  const name = encoder.encode(key);
+  const frame = new Uint8Array(1 + name.length);
+  frame[0] = KIND_KEY;
+  frame.set(name, 1);
+  socket.send(frame);
+}
+
 export function setupKeyboardControl(socket: WebSocket): void {
   log('keyboard control enabled: arrows, Enter, Backspace, Home');
   window.addEventListener('click', () => window.focus(), { passive: true });
@@ -49,7 +66,7 @@ export function setupKeyboardControl(socket: WebSocket): void {
       if (!key) return;
 
       e.preventDefault();
-      sendControlWS(socket, { kind: 'key', key });
+      sendKeyWS(socket, key);
     },
     { passive: false }
   );
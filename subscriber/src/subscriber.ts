@@ -15,6 +15,28 @@ let offerCount = 0;
 // IMPORTANT: keep this across offer until applied
 let pendingCandidates: unknown[] = [];
 
+// Local candidates gathered within this window go out as one 'candidates' frame
+const CANDIDATE_BATCH_WINDOW_MS = 5;
+let outgoingCandidates: RTCIceCandidateInit[] = [];
+let candidateFlushTimer: number | undefined = undefined;
+
+function queueLocalCandidate(candidate: RTCIceCandidateInit): void {
+  outgoingCandidates.push(candidate);
+  if (candidateFlushTimer !== undefined) return;
+  candidateFlushTimer = window.setTimeout(() => {
+    candidateFlushTimer = undefined;
+    const items = outgoingCandidates;
+    outgoingCandidates = [];
+    ws.send(
+      JSON.stringify({
+        type: 'candidates',
+        subscriberId: subscriberId,
+        items,
+      })
+    );
+  }, CANDIDATE_BATCH_WINDOW_MS);
+}
+
 // ---- WebSocket URL ----
 const wsParam = new URLSearchParams(location.search).get('ws');
 const WS_URL =
@@ -52,15 +74,7 @@ const ws = createWebSocket(
 
     // Always override onicecandidate to include subscriberId (for both new and reused PCs)
     pc.onicecandidate = (ev) => {
-      if (ev.candidate) {
-        ws.send(
-          JSON.stringify({
-            type: 'candidate',
-            subscriberId: subscriberId,
-            candidate: ev.candidate.toJSON(),
-          })
-        );
-      }
+      if (ev.candidate) queueLocalCandidate(ev.candidate.toJSON());
     };
 
     remoteDescriptionSet = false;
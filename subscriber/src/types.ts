@@ -24,6 +24,11 @@ export type CandidateMsg = {
   candidate: unknown;
   subscriberId?: string;
 };
+export type CandidatesMsg = {
+  type: 'candidates';
+  items: unknown[];
+  subscriberId?: string;
+};
 export type ControlStatusMsg = { type: 'control-status'; payload: unknown };
 export type ViewerReadyMsg = { type: 'viewer-ready' };
 
@@ -31,6 +36,7 @@ export type IncomingMsg =
   | HelloAckMsg
   | OfferMsg
   | CandidateMsg
+  | CandidatesMsg
   | ControlStatusMsg
   | { type: string; [k: string]: unknown };
 
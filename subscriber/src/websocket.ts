@@ -7,6 +7,7 @@ import type {
   HelloAckMsg,
   OfferMsg,
   CandidateMsg,
+  CandidatesMsg,
   ViewerReadyMsg,
 } from './types';
 
@@ -50,6 +51,12 @@ export function createWebSocket(
     return msg.type === 'candidate' && 'candidate' in msg;
   }
 
+  function isCandidatesMsg(msg: IncomingMsg): msg is CandidatesMsg {
+    return (
+      msg.type === 'candidates' && 'items' in msg && Array.isArray(msg.items)
+    );
+  }
+
   ws.onmessage = async (ev) => {
     let msg: IncomingMsg;
     try {
@@ -75,9 +82,11 @@ export function createWebSocket(
       return;
     }
 
-    if (msg.type === 'candidate') {
+    if (isCandidateMsg(msg) || isCandidatesMsg(msg)) {
       // candidates can arrive before offer/PC/remote description
-      addPendingCandidate(msg.candidate);
+      // (the publisher batches trickled candidates into a single 'candidates' frame)
+      const items = isCandidatesMsg(msg) ? msg.items : [msg.candidate];
+      for (const c of items) addPendingCandidate(c);
 
       const pc = getPC();
       const remoteDescriptionSet = getRemoteDescriptionSet();